@@ -0,0 +1,97 @@
+import os
+import pickle
+
+import pygame
+
+IMG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "imgs")  # directorul cu imaginile jocului
+
+# Pachetul opțional cu imaginile deja scalate (se construiește la prima folosire dacă lipsește sau e vechi)
+BUNDLE_PATH = os.environ.get("FLAPPY_ASSET_BUNDLE")
+
+# Cum se obține fiecare imagine din fișierul PNG original
+LOADERS = {
+    "pipe": ("pipe.png", pygame.transform.scale2x),  # imaginea pentru țevi
+    "bg": ("bg.png", lambda img: pygame.transform.scale(img, (600, 900))),  # imaginea pentru fundal
+    "base": ("base.png", pygame.transform.scale2x),  # imaginea pentru baza (podea)
+    "bird1": ("bird1.png", pygame.transform.scale2x),  # imaginile pentru pasăre (animație)
+    "bird2": ("bird2.png", pygame.transform.scale2x),
+    "bird3": ("bird3.png", pygame.transform.scale2x),
+}
+
+_images = {}  # numele imaginii -> suprafața scalată, încărcată la prima folosire
+
+
+def get_image(name):
+    """
+    Returnează o imagine scalată, încărcând-o la prima folosire
+    :param name: numele imaginii (o cheie din LOADERS)
+    :return: suprafața pygame
+    """
+    if name not in _images:
+        if BUNDLE_PATH is not None:  # toate imaginile dintr-o singură citire
+            _images.update(load_bundle(BUNDLE_PATH))
+        else:
+            _images[name] = load_image(name)
+    return _images[name]
+
+
+def set_image(name, surface):
+    """
+    Înlocuiește o imagine încărcată (de exemplu cu varianta convertită pentru fereastră)
+    :param name: numele imaginii
+    :param surface: noua suprafață
+    :return: None
+    """
+    _images[name] = surface
+
+
+def load_image(name):
+    """
+    Încarcă și scalează o imagine din fișierul PNG
+    :param name: numele imaginii (o cheie din LOADERS)
+    :return: suprafața pygame
+    """
+    filename, transform = LOADERS[name]
+    return transform(pygame.image.load(os.path.join(IMG_DIR, filename)))
+
+
+def _source_mtimes():
+    """
+    :return: dicționar fișier PNG -> momentul ultimei modificări
+    """
+    return {filename: os.path.getmtime(os.path.join(IMG_DIR, filename)) for filename, _ in LOADERS.values()}
+
+
+def build_bundle(path):
+    """
+    Scalează toate imaginile și le salvează ca pixeli RGBA într-un singur fișier
+    :param path: fișierul pachetului
+    :return: dicționar nume -> suprafață
+    """
+    images = {name: load_image(name) for name in LOADERS}
+    data = {
+        "mtimes": _source_mtimes(),
+        "images": {name: (img.get_size(), pygame.image.tobytes(img, "RGBA")) for name, img in images.items()},
+    }
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)  # alt proces nu poate citi un pachet scris pe jumătate
+    return images
+
+
+def load_bundle(path):
+    """
+    Încarcă toate imaginile din pachet, reconstruindu-l dacă lipsește sau dacă
+    fișierele PNG s-au schimbat
+    :param path: fișierul pachetului
+    :return: dicționar nume -> suprafață
+    """
+    try:
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return build_bundle(path)
+    if data.get("mtimes") != _source_mtimes() or set(data["images"]) != set(LOADERS):
+        return build_bundle(path)
+    return {name: pygame.image.frombytes(pixels, size, "RGBA") for name, (size, pixels) in data["images"].items()}
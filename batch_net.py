@@ -0,0 +1,143 @@
+import numpy as np
+import neat
+
+# Variantele vectoriale ale funcțiilor de activare din neat-python (aceleași limite ca în neat.activations)
+ACTIVATIONS = {
+    neat.activations.sigmoid_activation: lambda z: 1.0 / (1.0 + np.exp(-np.clip(5.0 * z, -60.0, 60.0))),
+    neat.activations.tanh_activation: lambda z: np.tanh(np.clip(2.5 * z, -60.0, 60.0)),
+    neat.activations.relu_activation: lambda z: np.maximum(z, 0.0),
+    neat.activations.identity_activation: lambda z: z,
+    neat.activations.clamped_activation: lambda z: np.clip(z, -1.0, 1.0),
+}
+
+
+class BatchNetwork:
+    """
+    Evaluează deodată toate rețelele unei generații. Nodurile tuturor rețelelor
+    sunt puse într-un singur tablou de valori și grupate pe straturi (adâncimea
+    nodului în rețeaua lui), iar fiecare strat este calculat cu câteva operații
+    NumPy pentru toată populația
+    """
+
+    def __init__(self, nets):
+        """
+        Compilează rețelele create cu neat.nn.FeedForwardNetwork.create
+        :param nets: lista de rețele neuronale (toate cu același număr de intrări și ieșiri)
+        :return: None
+        """
+        self.size = len(nets)  # numărul de rețele
+        num_inputs = len(nets[0].input_nodes) if nets else 0
+        num_outputs = len(nets[0].output_nodes) if nets else 0
+
+        input_slots = np.zeros((self.size, num_inputs), dtype=np.int64)
+        output_slots = np.zeros((self.size, num_outputs), dtype=np.int64)
+        layers = {}  # adâncime -> listele cu datele nodurilor din acel strat
+        slots = 0  # numărul de poziții ocupate în tabloul de valori
+
+        for n, net in enumerate(nets):
+            slot = {}  # cheia nodului -> poziția lui în tabloul de valori
+            depth = {}  # cheia nodului -> adâncimea lui
+            for k in net.input_nodes + net.output_nodes:  # la fel ca în activate(), pornesc cu valoarea 0
+                slot[k] = slots
+                slots += 1
+            for k in net.input_nodes:
+                depth[k] = 0
+
+            # node_evals este deja în ordine topologică
+            for node, act_func, agg_func, bias, response, links in net.node_evals:
+                if agg_func is not neat.aggregations.sum_aggregation or act_func not in ACTIVATIONS:
+                    raise ValueError("Nodul {} folosește o funcție care nu poate fi vectorizată".format(node))
+                if node not in slot:
+                    slot[node] = slots
+                    slots += 1
+                depth[node] = 1 + max([depth[i] for i, w in links], default=0)
+
+                layer = layers.setdefault(depth[node], {"slots": [], "act": [], "bias": [], "response": [],
+                                                        "src": [], "dst": [], "weight": []})
+                row = len(layer["slots"])  # poziția nodului în strat
+                layer["slots"].append(slot[node])
+                layer["act"].append(ACTIVATIONS[act_func])
+                layer["bias"].append(bias)
+                layer["response"].append(response)
+                for i, w in links:
+                    layer["src"].append(slot[i])
+                    layer["dst"].append(row)
+                    layer["weight"].append(w)
+
+            input_slots[n] = [slot[k] for k in net.input_nodes]
+            output_slots[n] = [slot[k] for k in net.output_nodes]
+
+        self.num_slots = slots
+        self.input_slots = input_slots
+        self.output_slots = output_slots
+        self.layers = [self._compile_layer(layers[d]) for d in sorted(layers)]
+        self.expanded = {1: (self.layers, self.input_slots[None], self.output_slots[None])}  # vezi expand()
+
+    @staticmethod
+    def _compile_layer(layer):
+        """
+        Transformă listele unui strat în tablouri NumPy
+        :param layer: dicționarul cu datele nodurilor din strat
+        :return: dicționarul cu tablourile stratului
+        """
+        # Nodurile sunt grupate după funcția de activare, ca fiecare funcție să fie aplicată o singură dată
+        groups = {}
+        for row, act in enumerate(layer["act"]):
+            groups.setdefault(act, []).append(row)
+        return {
+            "slots": np.array(layer["slots"], dtype=np.int64),
+            "bias": np.array(layer["bias"], dtype=float),
+            "response": np.array(layer["response"], dtype=float),
+            "src": np.array(layer["src"], dtype=np.int64),
+            "dst": np.array(layer["dst"], dtype=np.int64),
+            "weight": np.array(layer["weight"], dtype=float),
+            "groups": [(act, np.array(rows, dtype=np.int64)) for act, rows in groups.items()],
+        }
+
+    def expand(self, k):
+        """
+        Pregătește straturile pentru k seturi de intrări calculate deodată: tabloul
+        de valori are k copii, iar indicii fiecărei copii sunt decalați cu num_slots
+        (respectiv cu mărimea stratului pentru rezultatul lui bincount)
+        :param k: numărul de seturi de intrări (int)
+        :return: (straturile, pozițiile intrărilor, pozițiile ieșirilor)
+        """
+        if k not in self.expanded:
+            offset = np.arange(k)[:, None, None]  # copia fiecărui set
+            layers = []
+            for layer in self.layers:
+                n = len(layer["slots"])
+                layers.append({
+                    "slots": (layer["slots"] + self.num_slots * offset[:, 0]).ravel(),
+                    "bias": np.tile(layer["bias"], k),
+                    "response": np.tile(layer["response"], k),
+                    "src": (layer["src"] + self.num_slots * offset[:, 0]).ravel(),
+                    "dst": (layer["dst"] + n * offset[:, 0]).ravel(),
+                    "weight": np.tile(layer["weight"], k),
+                    "groups": [(act, (rows + n * offset[:, 0]).ravel()) for act, rows in layer["groups"]],
+                })
+            self.expanded[k] = (layers, self.input_slots + self.num_slots * offset,
+                                self.output_slots + self.num_slots * offset)
+        return self.expanded[k]
+
+    def activate(self, inputs):
+        """
+        Calculează ieșirile tuturor rețelelor, opțional pentru mai multe seturi de
+        intrări deodată (de exemplu câte unul pentru fiecare traseu)
+        :param inputs: tablou de forma (număr de rețele, număr de intrări) sau
+            (număr de seturi, număr de rețele, număr de intrări)
+        :return: tablou de forma (număr de rețele, număr de ieșiri) sau
+            (număr de seturi, număr de rețele, număr de ieșiri)
+        """
+        batch = inputs.shape[:-2]  # () pentru un singur set de intrări
+        k = int(np.prod(batch))
+        layers, input_slots, output_slots = self.expand(k)
+        values = np.zeros(k * self.num_slots)
+        values[input_slots] = inputs.reshape(input_slots.shape)
+        for layer in layers:
+            n = len(layer["slots"])
+            s = np.bincount(layer["dst"], weights=values[layer["src"]] * layer["weight"], minlength=n)  # agregarea sum
+            z = layer["bias"] + layer["response"] * s
+            for act, rows in layer["groups"]:
+                values[layer["slots"][rows]] = act(z[rows])
+        return values[output_slots].reshape(batch + self.output_slots.shape)
@@ -0,0 +1,189 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # benchmark-ul rulează fără afișaj
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+import timeit
+
+import neat
+import numpy as np
+
+import course
+import flappy_bird
+import limits
+
+
+def load_config(config_file, pop_size):
+    """
+    Încarcă configurația NEAT cu o altă mărime a populației
+    :param config_file: locația fișierului de configurare
+    :param pop_size: mărimea populației (int)
+    :return: configurația NEAT
+    """
+    config = neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                config_file)
+    config.pop_size = pop_size
+    config.no_fitness_termination = True  # rulează mereu toate generațiile cerute
+    return config
+
+
+def bench_generations(config_file, pop_size, generations, seed, max_frames):
+    """
+    Rulează câteva generații headless cu sămânță fixă și măsoară viteza simulării
+    :param config_file: locația fișierului de configurare
+    :param pop_size: mărimea populației (int)
+    :param generations: numărul de generații (int)
+    :param seed: sămânța pentru NEAT și pentru traseu (int)
+    :param max_frames: limita de frame-uri pe generație (int)
+    :return: dicționar cu rezultatele
+    """
+    random.seed(seed)
+    config = load_config(config_file, pop_size)
+    track = course.Course(seed)
+    records = []
+
+    def eval_genomes(genomes, config):
+        flappy_bird.COUNTERS.clear()
+        start = time.perf_counter()
+        fitness = flappy_bird.simulate([genome for genome_id, genome in genomes], config, track,
+                                       max_frames=max_frames)
+        wall = time.perf_counter() - start
+        for (genome_id, genome), value in zip(genomes, fitness):
+            genome.fitness = float(value)
+
+        counters = flappy_bird.COUNTERS
+        records.append({
+            "wall_time": wall,
+            "frames": counters["frames"],
+            "sim_steps_per_sec": counters["bird_steps"] / wall,
+            "activations_per_sec": counters["activations"] / wall,
+            "collision_checks_per_sec": counters["collision_checks"] / wall,
+            "gap_checks": counters["gap_checks"],
+            "mask_checks": counters["mask_checks"],
+            "best_fitness": float(max(fitness)),
+        })
+
+    p = neat.Population(config)
+    p.run(eval_genomes, generations)
+
+    return {
+        "pop_size": pop_size,
+        "generations": records,
+        "mean_wall_time": sum(r["wall_time"] for r in records) / len(records),
+        "mean_sim_steps_per_sec": sum(r["sim_steps_per_sec"] for r in records) / len(records),
+    }
+
+
+def bench_components(pop_size, number=200):
+    """
+    Măsoară separat funcțiile principale ale simulării
+    :param pop_size: numărul de păsări pentru variantele vectoriale (int)
+    :param number: de câte ori este apelată fiecare funcție (int)
+    :return: dicționar cu timpul mediu pe apel, în microsecunde
+    """
+    bird = flappy_bird.Bird(230, 350)
+    pipe = flappy_bird.Pipe(230, 250)  # țeava este chiar în dreptul păsării
+    birds = flappy_bird.BirdPopulation(pop_size, 230, 350)
+    base = flappy_bird.Base(flappy_bird.FLOOR)
+    win = flappy_bird.get_window()
+
+    def bird_move():
+        bird.y = 350  # pasărea rămâne pe ecran
+        bird.move()
+
+    timings = {
+        "Bird.move": bird_move,
+        "Pipe.collide": lambda: pipe.collide(bird, win),
+        "BirdPopulation.move": birds.move,
+        "BirdPopulation.collide": lambda: birds.collide([pipe]),
+        "draw_window": lambda: flappy_bird.draw_window(win, birds, [pipe], base, 0, 1, 0),
+    }
+    return {name: timeit.timeit(func, number=number) / number * 1e6 for name, func in timings.items()}
+
+
+def check_cutoff(config_file, pop_size, seeds, max_frames, cutoff=1):
+    """
+    Verifică oprirea timpurie: cu cutoff 1, clasamentul complet al populației
+    (ordinea după fitness) trebuie să fie același ca fără oprire
+    :param config_file: locația fișierului de configurare
+    :param pop_size: mărimea populației (int)
+    :param seeds: sămânțele populațiilor și ale traseelor (listă de int)
+    :param max_frames: limita de frame-uri, pentru genomurile care nu mor niciodată (int)
+    :param cutoff: numărul de păsări la care se oprește jocul (int)
+    :return: lista (sămânță, frame-ul opririi, primii 5 fără oprire, primii 5 cu oprire) pentru diferențe
+    """
+    config = load_config(config_file, pop_size)
+    mismatches = []
+    for seed in seeds:
+        random.seed(seed)
+        genomes = list(neat.Population(config).population.values())
+        track = course.Course(seed)
+        full = flappy_bird.simulate(genomes, config, track, max_frames=max_frames)
+        stop = limits.GenerationLimits(max_frames=max_frames, cutoff=cutoff)
+        cut = flappy_bird.simulate(genomes, config, track, limits=stop)
+        full_order = np.argsort(-full, kind="stable")
+        cut_order = np.argsort(-cut, kind="stable")
+        if not np.array_equal(full_order, cut_order):
+            mismatches.append((seed, stop.frames, full_order[:5].tolist(), cut_order[:5].tolist()))
+    return mismatches
+
+
+def git_commit():
+    """
+    :return: commit-ul curent (str) sau None dacă nu există git
+    """
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),  # commit-ul proiectului, nu al directorului curent
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == '__main__':
+    local_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Măsoară viteza simulării Flappy Bird")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 200, 2000], help="mărimile populației")
+    parser.add_argument("--generations", type=int, default=3, help="generații pentru fiecare mărime")
+    parser.add_argument("--seed", type=int, default=0, help="sămânța pentru NEAT și traseu")
+    parser.add_argument("--max-frames", type=int, default=3000, help="limita de frame-uri pe generație")
+    parser.add_argument("--config", default=os.path.join(local_dir, "config-feedforward.txt"), help="fișierul de configurare NEAT")
+    parser.add_argument("--output", default=None, help="fișierul JSON pentru rezultate")
+    parser.add_argument("--check-cutoff", type=int, default=0, metavar="N",
+                        help="verifică doar că --early-cutoff 1 păstrează clasamentul, pe N populații")
+    args = parser.parse_args()
+
+    if args.check_cutoff:
+        seeds = range(args.seed, args.seed + args.check_cutoff)
+        mismatches = check_cutoff(args.config, min(args.sizes), seeds, args.max_frames)
+        for seed, frames, full_top, cut_top in mismatches:
+            print("sămânța {}: oprit la frame-ul {}, primii fără oprire {}, cu oprire {}".format(
+                seed, frames, full_top, cut_top))
+        print("{} din {} populații au alt clasament cu oprirea timpurie".format(len(mismatches), len(seeds)))
+        raise SystemExit(1 if mismatches else 0)
+
+    results = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": args.seed,
+        "max_frames": args.max_frames,
+        "populations": [],
+    }
+    for size in args.sizes:
+        result = bench_generations(args.config, size, args.generations, args.seed, args.max_frames)
+        results["populations"].append(result)
+        print("pop_size {:6d}: {:8.3f} s/generație, {:12.0f} pași/s".format(
+            size, result["mean_wall_time"], result["mean_sim_steps_per_sec"]))
+    results["components_us"] = bench_components(max(args.sizes))
+    for name, micros in results["components_us"].items():
+        print("{:24s} {:10.1f} µs/apel".format(name, micros))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
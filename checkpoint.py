@@ -0,0 +1,160 @@
+import glob
+import gzip
+import itertools
+import os
+import pickle
+import random
+import threading
+import time
+
+import neat
+from neat.reporting import BaseReporter
+
+PREFIX = "neat-checkpoint-"  # prefixul fișierelor de checkpoint
+
+
+class Checkpointer(BaseReporter):
+    """
+    Salvează starea antrenării la un număr de generații și/sau după un interval
+    de timp. Starea este serializată în procesul principal (e consistentă cu
+    generația curentă), iar compresia și scrierea pe disc se fac pe un fir
+    separat, într-un fișier temporar redenumit atomic la final
+    """
+
+    def __init__(self, directory, generation_interval=5, time_interval=None, state_func=None):
+        """
+        Creează reporterul
+        :param directory: directorul pentru checkpoint-uri (str)
+        :param generation_interval: salvează la fiecare N generații (int sau None)
+        :param time_interval: salvează după cel mult atâtea secunde (float sau None)
+        :param state_func: funcție care returnează starea suplimentară de salvat (dict)
+        :return: None
+        """
+        self.directory = directory
+        self.generation_interval = generation_interval
+        self.time_interval = time_interval
+        self.state_func = state_func
+        self.current_generation = None
+        self.last_generation = None  # generația ultimului checkpoint
+        self.last_time = time.time()  # momentul ultimului checkpoint
+        self.writer = None  # firul care scrie ultimul checkpoint
+        os.makedirs(directory, exist_ok=True)
+
+    def start_generation(self, generation):
+        self.current_generation = generation
+
+    def end_generation(self, config, population, species_set):
+        due = False
+        if self.generation_interval is not None:
+            last = -1 if self.last_generation is None else self.last_generation
+            due = self.current_generation - last >= self.generation_interval
+        if self.time_interval is not None:
+            due = due or time.time() - self.last_time >= self.time_interval
+
+        if due:
+            self.save(config, population, species_set, self.current_generation)
+            self.last_generation = self.current_generation
+            self.last_time = time.time()
+
+    def save(self, config, population, species_set, generation):
+        """
+        Salvează un checkpoint pentru generația dată
+        :param config: configurația NEAT
+        :param population: populația (dict id -> genom)
+        :param species_set: mulțimea de specii
+        :param generation: generația tocmai terminată (int)
+        :return: None
+        """
+        state = self.state_func() if self.state_func is not None else {}
+
+        # Reporterii (inclusiv acesta) nu fac parte din stare și nu pot fi mereu serializați
+        reporters = species_set.reporters
+        species_set.reporters = None
+        try:
+            data = pickle.dumps((generation, config, population, species_set, random.getstate(), state),
+                                protocol=pickle.HIGHEST_PROTOCOL)
+        finally:
+            species_set.reporters = reporters
+        path = os.path.join(self.directory, "{}{}.gz".format(PREFIX, generation))
+        print("Salvez checkpoint-ul {}".format(path))
+
+        self.wait()  # cel mult o scriere în desfășurare
+        self.writer = threading.Thread(target=_write_atomic, args=(path, data), daemon=True)
+        self.writer.start()
+
+    def wait(self):
+        """
+        Așteaptă terminarea scrierii în desfășurare
+        :return: None
+        """
+        if self.writer is not None:
+            self.writer.join()
+            self.writer = None
+
+
+def _write_atomic(path, data):
+    """
+    Comprimă datele și le scrie într-un fișier temporar care ia apoi locul
+    fișierului final, ca un checkpoint să nu rămână niciodată scris pe jumătate
+    :param path: fișierul final (str)
+    :param data: datele serializate (bytes)
+    :return: None
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(gzip.compress(data, compresslevel=5))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def latest_checkpoint(directory):
+    """
+    Găsește cel mai recent checkpoint dintr-un director
+    :param directory: directorul cu checkpoint-uri (str)
+    :return: calea către fișier (str) sau None
+    """
+    paths = glob.glob(os.path.join(directory, PREFIX + "*.gz"))
+    if not paths:
+        return None
+    return max(paths, key=lambda p: int(os.path.basename(p)[len(PREFIX):-len(".gz")]))
+
+
+def restore_checkpoint(path):
+    """
+    Reface populația și generatorul aleator dintr-un checkpoint
+    :param path: fișierul checkpoint-ului (str)
+    :return: (neat.Population, starea suplimentară salvată)
+    """
+    with gzip.open(path) as f:
+        generation, config, population, species_set, rndstate, state = pickle.load(f)
+    random.setstate(rndstate)
+    p = neat.Population(config, (population, species_set, generation + 1))
+    species_set.reporters = p.reporters  # reporterii nu au fost salvați
+
+    # neat nu salvează contorul de id-uri, iar genomurile noi ar primi id-uri deja folosite
+    p.reproduction.genome_indexer = itertools.count(max(population) + 1)
+    return p, state
+
+
+def save_winner(path, genome, config):
+    """
+    Salvează cel mai bun genom și rețeaua lui într-un fișier comprimat
+    :param path: fișierul (str)
+    :param genome: genomul câștigător
+    :param config: configurația NEAT
+    :return: None
+    """
+    net = neat.nn.FeedForwardNetwork.create(genome, config)
+    data = pickle.dumps((genome, net), protocol=pickle.HIGHEST_PROTOCOL)
+    _write_atomic(path, data)
+
+
+def load_winner(path):
+    """
+    Încarcă un genom câștigător salvat cu save_winner
+    :param path: fișierul (str)
+    :return: (genomul, rețeaua neuronală)
+    """
+    with gzip.open(path) as f:
+        return pickle.load(f)
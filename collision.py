@@ -0,0 +1,115 @@
+import collections
+
+import numpy as np
+
+# O țeavă văzută de un grup de păsări; top și bottom pot fi tablouri, câte o valoare pentru fiecare pasăre
+PipeSpan = collections.namedtuple("PipeSpan", ["x", "top", "bottom"])
+
+
+class Collider:
+    """
+    Detectarea coliziunilor dintre păsări și țevi în trei etape, de la cea mai
+    ieftină la cea mai scumpă:
+    1. faza largă: țevile care nu se suprapun pe orizontală cu păsările sunt
+       ignorate (un singur test, toate păsările au aceeași poziție x)
+    2. deschiderea: păsările aflate în întregime între țeava de sus și cea de
+       jos sunt eliminate vectorial
+    3. faza exactă: măștile sunt comparate doar pentru păsările rămase
+    Țevile pot fi orice obiecte cu atributele x, top și bottom (vezi Pipe și PipeSpan)
+    """
+
+    def __init__(self, bird_masks, bird_bounds, pipe_top_mask, pipe_bottom_mask, pipe_top_bounds, pipe_bottom_bounds):
+        """
+        :param bird_masks: măștile pentru fiecare imagine a păsării (listă)
+        :param bird_bounds: tablou (x, y, w, h) cu pixelii opaci ai fiecărei imagini a păsării
+        :param pipe_top_mask: masca țevii de sus
+        :param pipe_bottom_mask: masca țevii de jos
+        :param pipe_top_bounds: dreptunghiul pixelilor opaci ai țevii de sus (pygame.Rect)
+        :param pipe_bottom_bounds: dreptunghiul pixelilor opaci ai țevii de jos (pygame.Rect)
+        :return: None
+        """
+        self.bird_masks = bird_masks
+        self.bird_bounds = bird_bounds
+        self.pipe_top_mask = pipe_top_mask
+        self.pipe_bottom_mask = pipe_bottom_mask
+        self.pipe_top_bounds = pipe_top_bounds
+        self.pipe_bottom_bounds = pipe_bottom_bounds
+
+        # Intervalele pe orizontală, față de poziția x, valabile pentru orice imagine a păsării
+        self.bird_left = int(bird_bounds[:, 0].min())
+        self.bird_right = int((bird_bounds[:, 0] + bird_bounds[:, 2]).max())
+        self.pipe_left = min(pipe_top_bounds.left, pipe_bottom_bounds.left)
+        self.pipe_right = max(pipe_top_bounds.right, pipe_bottom_bounds.right)
+
+    def broad_phase(self, x, pipes):
+        """
+        Alege țevile care se suprapun pe orizontală cu păsările
+        :param x: poziția x a păsărilor (int)
+        :param pipes: lista de țevi
+        :return: lista țevilor apropiate
+        """
+        left = x + self.bird_left
+        right = x + self.bird_right
+        return [pipe for pipe in pipes if left < pipe.x + self.pipe_right and right > pipe.x + self.pipe_left]
+
+    def vertical_extent(self, y, frame):
+        """
+        :param y: pozițiile y rotunjite (tablou de int)
+        :param frame: indexul imaginii fiecărei păsări (tablou de int)
+        :return: (marginile de sus, marginile de jos) ale pixelilor opaci ai păsărilor
+        """
+        bounds = self.bird_bounds[frame]
+        top = y + bounds[:, 1]
+        return top, top + bounds[:, 3]
+
+    def outside_gap(self, top, bottom, pipe):
+        """
+        Găsește păsările care nu sunt în întregime în deschiderea dintre țevi
+        :param top: marginile de sus ale păsărilor (tablou, vezi vertical_extent)
+        :param bottom: marginile de jos ale păsărilor (tablou)
+        :param pipe: țeava
+        :return: tablou bool cu păsările care ar putea atinge țeava
+        """
+        top_rect, bottom_rect = self.pipe_top_bounds, self.pipe_bottom_bounds
+        return (((top < pipe.top + top_rect.bottom) & (bottom > pipe.top + top_rect.top)) |
+                ((top < pipe.bottom + bottom_rect.bottom) & (bottom > pipe.bottom + bottom_rect.top)))
+
+    def narrow_phase(self, x, y, frame, pipe):
+        """
+        Testul exact, cu măști, pentru o singură pasăre
+        :param x: poziția x a păsării (int)
+        :param y: poziția y rotunjită (int)
+        :param frame: indexul imaginii păsării (int)
+        :param pipe: țeava
+        :return: True dacă pasărea atinge țeava
+        """
+        bird_mask = self.bird_masks[frame]
+        return bool(bird_mask.overlap(self.pipe_bottom_mask, (pipe.x - x, pipe.bottom - y)) or
+                    bird_mask.overlap(self.pipe_top_mask, (pipe.x - x, pipe.top - y)))
+
+    def collide(self, x, y, frame, pipes):
+        """
+        Verifică coliziunea unor păsări cu toate țevile
+        :param x: poziția x a păsărilor (int)
+        :param y: pozițiile y rotunjite (tablou de int)
+        :param frame: indexul imaginii fiecărei păsări (tablou de int)
+        :param pipes: lista de țevi (top și bottom pot fi tablouri cu câte o valoare pentru fiecare pasăre)
+        :return: (hit, gap_checks, mask_checks) - tablou bool cu păsările care au atins cel puțin o țeavă,
+            numărul de perechi pasăre-țeavă verificate cu outside_gap și numărul de teste cu măști făcute
+        """
+        hit = np.zeros(len(y), dtype=bool)
+        near = self.broad_phase(x, pipes)
+        if not near:  # cazul obișnuit: nicio țeavă în dreptul păsărilor
+            return hit, 0, 0
+        top, bottom = self.vertical_extent(y, frame)
+        gap_checks = mask_checks = 0
+        for pipe in near:
+            # Cu mai multe trasee jucate deodată, fiecare pasăre are propria înălțime a țevii
+            tops = np.broadcast_to(pipe.top, y.shape)
+            bottoms = np.broadcast_to(pipe.bottom, y.shape)
+            candidates = np.flatnonzero(self.outside_gap(top, bottom, pipe) & ~hit)
+            gap_checks += len(y)
+            mask_checks += len(candidates)
+            for i in candidates:
+                hit[i] = self.narrow_phase(x, y[i], frame[i], PipeSpan(pipe.x, tops[i], bottoms[i]))
+        return hit, gap_checks, mask_checks
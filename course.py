@@ -0,0 +1,77 @@
+import functools
+import random
+
+import numpy as np
+
+MIN_HEIGHT = 50  # cea mai mică înălțime a deschiderii dintre țevi
+MAX_HEIGHT = 450  # limita superioară (exclusivă) a înălțimii
+
+
+class Course:
+    """
+    Traseul unui joc: șirul înălțimilor țevilor, generat dintr-o sămânță și
+    păstrat într-un tablou compact. Același traseu poate fi trimis oricărui
+    evaluator (cu fereastră, headless sau în alt proces)
+    """
+    LENGTH = 256  # numărul de țevi precalculate
+
+    def __init__(self, seed, length=LENGTH):
+        """
+        Generează traseul
+        :param seed: sămânța traseului (int)
+        :param length: numărul de țevi precalculate (int)
+        :return: None
+        """
+        self.seed = seed
+        self.heights = self._generate(length)
+
+    def _generate(self, length):
+        """
+        Generează primele length înălțimi. Șirul depinde doar de sămânță, deci
+        un traseu mai lung începe mereu cu aceleași țevi ca unul mai scurt
+        :param length: numărul de țevi (int)
+        :return: tablou NumPy cu înălțimile
+        """
+        rng = random.Random(self.seed)
+        return np.array([rng.randrange(MIN_HEIGHT, MAX_HEIGHT) for _ in range(length)], dtype=np.int16)
+
+    def height(self, index):
+        """
+        Returnează înălțimea țevii cu numărul index, prelungind traseul dacă e nevoie
+        :param index: numărul țevii, de la 0 (int)
+        :return: înălțimea (int)
+        """
+        if index >= len(self.heights):  # o pasăre foarte bună a ajuns la capătul traseului
+            self.heights = self._generate(max(index + 1, 2 * len(self.heights)))
+        return int(self.heights[index])
+
+
+@functools.lru_cache(maxsize=64)
+def get_course(seed):
+    """
+    Returnează traseul pentru o sămânță, construit o singură dată
+    :param seed: sămânța traseului (int)
+    :return: Course
+    """
+    return Course(seed)
+
+
+def course_seeds(seed, count):
+    """
+    Derivă sămânțele pentru mai multe trasee dintr-o singură sămânță
+    :param seed: sămânța de bază (int)
+    :param count: numărul de trasee (int)
+    :return: lista de sămânțe
+    """
+    rng = random.Random(seed)
+    return [seed] + [rng.getrandbits(32) for _ in range(count - 1)]
+
+
+def heights(courses, index):
+    """
+    Returnează înălțimile țevii cu numărul index pe mai multe trasee jucate deodată
+    :param courses: lista de trasee (Course)
+    :param index: numărul țevii, de la 0 (int)
+    :return: tablou NumPy cu câte o înălțime pentru fiecare traseu
+    """
+    return np.array([track.height(index) for track in courses])
@@ -0,0 +1,103 @@
+import collections
+import hashlib
+import sqlite3
+
+
+def genome_key(genome, seeds, context=()):
+    """
+    Calculează o cheie canonică pentru fitness-ul unui genom: conexiunile active
+    cu ponderile lor, parametrii nodurilor și sămânțele traseelor. Două genomuri
+    cu aceeași cheie joacă identic, deci au același fitness
+    :param genome: genomul NEAT
+    :param seeds: sămânțele traseelor pe care este evaluat (listă)
+    :param context: alte setări de care depinde fitness-ul, de exemplu limitele jocului (tuplu)
+    :return: cheia (str, hash hex)
+    """
+    connections = sorted((key, cg.weight) for key, cg in genome.connections.items() if cg.enabled)
+    nodes = sorted((key, ng.bias, ng.response, ng.activation, ng.aggregation) for key, ng in genome.nodes.items())
+    parts = (connections, nodes, tuple(seeds))
+    if context:  # fără context, cheile rămân aceleași ca în cache-urile mai vechi
+        parts += (tuple(context),)
+    text = repr(parts)  # repr păstrează exact valorile float
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+class FitnessCache:
+    """
+    Memorează fitness-ul genomurilor deja evaluate, ca elitele și genomurile
+    neschimbate să nu mai fie simulate din nou. Păstrează în memorie cele mai
+    recent folosite max_size intrări și, opțional, toate intrările pe disc
+    """
+
+    def __init__(self, max_size=100000, path=None):
+        """
+        Creează cache-ul
+        :param max_size: numărul maxim de intrări păstrate în memorie (int)
+        :param path: fișierul SQLite pentru păstrarea pe disc (str sau None)
+        :return: None
+        """
+        self.max_size = max_size
+        self.entries = collections.OrderedDict()  # cheie -> fitness, în ordinea folosirii
+        self.hits = 0  # numărul de căutări găsite
+        self.misses = 0  # numărul de căutări negăsite
+
+        self.db = None
+        if path is not None:
+            self.db = sqlite3.connect(path)
+            self.db.execute("CREATE TABLE IF NOT EXISTS fitness (key TEXT PRIMARY KEY, value REAL)")
+
+    def get(self, key):
+        """
+        Caută fitness-ul pentru o cheie
+        :param key: cheia genomului (str)
+        :return: fitness-ul (float) sau None dacă nu există
+        """
+        if key in self.entries:
+            self.entries.move_to_end(key)  # intrarea devine cea mai recent folosită
+            self.hits += 1
+            return self.entries[key]
+
+        if self.db is not None:  # caută și pe disc
+            row = self.db.execute("SELECT value FROM fitness WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._remember(key, row[0])
+                self.hits += 1
+                return row[0]
+
+        self.misses += 1
+        return None
+
+    def put(self, items):
+        """
+        Adaugă fitness-ul pentru mai multe genomuri (o singură scriere pe disc)
+        :param items: perechi (cheie, fitness)
+        :return: None
+        """
+        items = [(key, float(value)) for key, value in items]
+        for key, value in items:
+            self._remember(key, value)
+
+        if self.db is not None and items:
+            with self.db:  # o singură tranzacție
+                self.db.executemany("INSERT OR REPLACE INTO fitness (key, value) VALUES (?, ?)", items)
+
+    def _remember(self, key, value):
+        """
+        Păstrează o intrare în memorie, eliminând cea mai veche dacă se depășește limita
+        :param key: cheia genomului (str)
+        :param value: fitness-ul (float)
+        :return: None
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)  # elimină intrarea cel mai puțin recent folosită
+
+    def close(self):
+        """
+        Închide fișierul de pe disc
+        :return: None
+        """
+        if self.db is not None:
+            self.db.close()
+            self.db = None
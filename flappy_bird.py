@@ -1,27 +1,61 @@
+import argparse
+import collections
 import pygame
 import random
 import os
 import time
 import neat
-pygame.font.init()  # initializează fonturile în pygame
+import numpy as np
+from batch_net import BatchNetwork
+from parallel import ParallelEvaluator
+import course
+from fitness_cache import FitnessCache, genome_key
+from profiling import ProfilingReporter
+from telemetry import TelemetryReporter
+import checkpoint
+from replay import Replay, ReplayRecorder
+import limits as game_limits  # numele "limits" este folosit pentru limitele unei generații
+from assets import get_image, set_image
+from collision import Collider, PipeSpan
 
 # Constante pentru dimensiunile ferestrei și alte setări
 WIN_WIDTH = 600  # lățimea ferestrei de joc
 WIN_HEIGHT = 800  # înălțimea ferestrei de joc
 FLOOR = 730  # poziția podelei în joc
-STAT_FONT = pygame.font.SysFont("comicsans", 50)  # fontul pentru statistici
-END_FONT = pygame.font.SysFont("comicsans", 70)  # fontul pentru mesajul de final
+STAT_FONT = None  # fontul pentru statistici (se creează la prima randare)
+END_FONT = None  # fontul pentru mesajul de final (se creează la prima randare)
 DRAW_LINES = False  # decide dacă se desenează liniile pentru rețeaua neuronală
-
-# Inițializarea ferestrei pygame
-WIN = pygame.display.set_mode((WIN_WIDTH, WIN_HEIGHT))  # creează fereastra jocului
-pygame.display.set_caption("Flappy Bird")  # setează titlul ferestrei
-
-# Încărcarea imaginilor și redimensionarea lor
-pipe_img = pygame.transform.scale2x(pygame.image.load(os.path.join("imgs","pipe.png")).convert_alpha())  # imaginea pentru țevi
-bg_img = pygame.transform.scale(pygame.image.load(os.path.join("imgs","bg.png")).convert_alpha(), (600, 900))  # imaginea pentru fundal
-bird_images = [pygame.transform.scale2x(pygame.image.load(os.path.join("imgs","bird" + str(x) + ".png"))) for x in range(1,4)]  # imaginile pentru pasăre (animație)
-base_img = pygame.transform.scale2x(pygame.image.load(os.path.join("imgs","base.png")).convert_alpha())  # imaginea pentru baza (podea)
+DRAW_TOP = None  # desenează cel mult N păsări în viață (None = toate), pentru populații mari
+
+# Setări pentru modul de antrenare (pot fi schimbate din linia de comandă sau din run())
+HEADLESS = False  # dacă este True, simularea rulează fără fereastră și fără limită de FPS
+RENDER_EVERY = 0  # în modul headless, desenează totuși fiecare a N-a generație (0 = niciodată)
+EVALUATOR = None  # ParallelEvaluator pentru evaluarea pe mai multe procese (None = un singur proces)
+COURSE_SEED = None  # dacă este setată, toate generațiile joacă pe aceleași trasee (altfel trasee noi la fiecare generație)
+COURSES = 1  # numărul de trasee pe care este evaluat fiecare genom (fitness-ul este media)
+FITNESS_CACHE = None  # FitnessCache cu fitness-ul genomurilor deja evaluate (None = fără cache)
+PROFILER = None  # profiling.PhaseTimer care măsoară fazele buclei de joc (None = fără măsurare)
+REPLAY_DIR = None  # directorul în care se salvează înregistrarea fiecărei generații (None = fără înregistrări)
+
+# Limitele unei generații (None = fără limită), vezi limits.py. Fără ele, o generație cu un genom
+# foarte bun nu se termină niciodată
+MAX_FRAMES = None  # numărul maxim de frame-uri pe traseu
+MAX_SCORE = None  # scorul la care se oprește jocul
+TIME_BUDGET = None  # timpul maxim al unei generații, în secunde
+EARLY_CUTOFF = None  # oprește jocul când rămân în viață cel mult atâtea păsări, destul de departe de cele moarte (1 = clasamentul nu se mai schimbă);
+# doar cu un singur proces și un singur traseu, altfel nicio simulare nu vede toate păsările unui genom
+LAST_STOP = None  # (motivul, frame-uri) pentru ultima generație
+
+# Contoare pentru benchmark: frame-uri, pași ai păsărilor, activări ale rețelelor și verificări de coliziune
+COUNTERS = collections.Counter()
+ALIVE = collections.Counter()  # frame -> numărul de păsări în viață, adunat pe toate traseele generației
+ALIVE_POINTS = 100  # numărul maxim de puncte ale curbei păsărilor în viață din telemetrie
+
+# Fereastra pygame și fonturile se creează abia la prima randare, iar imaginile (vezi assets.py)
+# la prima folosire, ca importul modulului să fie rapid și să nu aibă nevoie de afișaj
+WIN = None
+SPRITES = None  # SpriteCache, construit la prima folosire (vezi get_sprites)
+RENDERER = None  # Renderer, creat la prima randare (vezi draw_window)
 
 #original_image = pygame.image.load(os.path.join("imgs", "image.png"))
 #resized_image = pygame.transform.scale(original_image, (600, 900))
@@ -40,7 +74,6 @@ class Bird:
     Clasa Bird reprezintă pasărea din jocul Flappy Bird
     """
     MAX_ROTATION = 25  # rotația maximă a păsării în grade
-    IMGS = bird_images  # imaginile pentru animația păsării
     ROT_VEL = 20  # viteza de rotație
     ANIMATION_TIME = 5  # timpul pentru animație
 
@@ -58,7 +91,8 @@ class Bird:
         self.vel = 0  # viteza păsării
         self.height = self.y  # înălțimea inițială a păsării
         self.img_count = 0  # contor pentru animație
-        self.img = self.IMGS[0]  # imaginea curentă a păsării
+        self.frame = 0  # indexul imaginii curente din animație
+        self.img = get_sprites().bird_imgs[0]  # imaginea curentă a păsării
 
     def jump(self):
         """
@@ -96,41 +130,51 @@ class Bird:
             if self.tilt > -90:  # verifică dacă nu a atins înclinarea maximă în jos
                 self.tilt -= self.ROT_VEL  # inclină pasărea în jos treptat
 
-    def draw(self, win):
+    def animate(self):
         """
-        Desenează pasărea pe ecran cu animație
-        :param win: fereastra pygame sau suprafață
+        Avansează animația păsării cu un frame. Este separată de draw() pentru că
+        imaginea curentă dă și masca de coliziune, deci trebuie actualizată și
+        atunci când nu se desenează nimic (modul headless)
         :return: None
         """
         self.img_count += 1  # incrementează contorul pentru animație
 
         # Animația păsării, ciclează prin cele trei imagini
         if self.img_count <= self.ANIMATION_TIME:  # prima imagine pentru primele ANIMATION_TIME frame-uri
-            self.img = self.IMGS[0]
+            self.frame = 0
         elif self.img_count <= self.ANIMATION_TIME*2:  # a doua imagine pentru următoarele ANIMATION_TIME frame-uri
-            self.img = self.IMGS[1]
+            self.frame = 1
         elif self.img_count <= self.ANIMATION_TIME*3:  # a treia imagine pentru următoarele ANIMATION_TIME frame-uri
-            self.img = self.IMGS[2]
+            self.frame = 2
         elif self.img_count <= self.ANIMATION_TIME*4:  # a doua imagine din nou pentru următoarele ANIMATION_TIME frame-uri
-            self.img = self.IMGS[1]
+            self.frame = 1
         elif self.img_count == self.ANIMATION_TIME*4 + 1:  # resetează animația după un ciclu complet
-            self.img = self.IMGS[0]
+            self.frame = 0
             self.img_count = 0
 
         # Când pasărea cade brusc, nu mai animează bătaia din aripi
         if self.tilt <= -80:  # dacă pasărea este înclinată foarte mult în jos
-            self.img = self.IMGS[1]  # folosește imaginea cu aripile la mijloc
+            self.frame = 1  # folosește imaginea cu aripile la mijloc
             self.img_count = self.ANIMATION_TIME*2  # ajustează contorul pentru a menține această imagine
 
-        # Desenează pasărea cu rotație
-        blitRotateCenter(win, self.img, (self.x, self.y), self.tilt)  # funcție helper pentru a desena imaginea rotită
+        self.img = get_sprites().bird_imgs[self.frame]  # imaginea curentă a păsării
+
+    def draw(self, win):
+        """
+        Desenează pasărea pe ecran (animația este avansată de animate())
+        :param win: fereastra pygame sau suprafață
+        :return: None
+        """
+        # Desenează pasărea cu rotație, folosind imaginea deja rotită din cache
+        rotated_image, offset = get_sprites().rotated_bird(self.frame, self.tilt)
+        win.blit(rotated_image, (self.x + offset[0], self.y + offset[1]))  # păstrează centrul imaginii pe loc
 
     def get_mask(self):
         """
         Obține masca pentru detectarea coliziunilor
         :return: Masca pygame pentru imaginea curentă
         """
-        return pygame.mask.from_surface(self.img)  # creează o mască din imaginea curentă pentru coliziuni precise
+        return get_sprites().bird_masks[self.frame]  # masca precalculată pentru imaginea curentă
 
 
 class Pipe():
@@ -140,10 +184,12 @@ class Pipe():
     GAP = 200  # spațiul dintre țeava de sus și cea de jos
     VEL = 5  # viteza de mișcare a țevilor
 
-    def __init__(self, x):
+    def __init__(self, x, height=None):
         """
         Inițializează obiectul țeavă
         :param x: poziția x a țevii (int)
+        :param height: înălțimea țevii, de obicei luată din Course (int sau None pentru aleator);
+            pentru mai multe trasee jucate deodată, un tablou cu câte o înălțime pentru fiecare traseu
         :return: None
         """
         self.x = x  # poziția x a țevii
@@ -153,20 +199,24 @@ class Pipe():
         self.top = 0  # poziția y a capătului de jos al țevii de sus
         self.bottom = 0  # poziția y a capătului de sus al țevii de jos
 
-        # Pregătește imaginile pentru țevi
-        self.PIPE_TOP = pygame.transform.flip(pipe_img, False, True)  # țeava de sus (imaginea întoarsă)
-        self.PIPE_BOTTOM = pipe_img  # țeava de jos (imaginea normală)
+        # Imaginile pentru țevi vin din cache (întoarcerea se face o singură dată)
+        sprites = get_sprites()
+        self.PIPE_TOP = sprites.pipe_top  # țeava de sus (imaginea întoarsă)
+        self.PIPE_BOTTOM = sprites.pipe_bottom  # țeava de jos (imaginea normală)
 
         self.passed = False  # marchează dacă pasărea a trecut de această țeavă
 
-        self.set_height()  # setează înălțimea aleatoare a țevilor
+        self.set_height(height)  # setează înălțimea țevilor
 
-    def set_height(self):
+    def set_height(self, height=None):
         """
-        Setează înălțimea țevilor în mod aleator
+        Setează înălțimea țevilor (în mod aleator dacă nu este dată)
+        :param height: înălțimea țevii (int, tablou de înălțimi sau None)
         :return: None
         """
-        self.height = random.randrange(50, 450)  # alege o înălțime aleatoare între 50 și 450
+        if height is None:  # alege o înălțime aleatoare între 50 și 450
+            height = random.randrange(course.MIN_HEIGHT, course.MAX_HEIGHT)
+        self.height = height
         self.top = self.height - self.PIPE_TOP.get_height()  # calculează poziția țevii de sus
         self.bottom = self.height + self.GAP  # calculează poziția țevii de jos
 
@@ -181,12 +231,13 @@ class Pipe():
         """
         Desenează ambele țevi (sus și jos)
         :param win: fereastra pygame
-        :return: None
+        :return: dreptunghiurile desenate (listă de pygame.Rect)
         """
         # Desenează țeava de sus
-        win.blit(self.PIPE_TOP, (self.x, self.top))  # desenează țeava de sus la poziția calculată
+        top = win.blit(self.PIPE_TOP, (self.x, self.top))  # desenează țeava de sus la poziția calculată
         # Desenează țeava de jos
-        win.blit(self.PIPE_BOTTOM, (self.x, self.bottom))  # desenează țeava de jos la poziția calculată
+        bottom = win.blit(self.PIPE_BOTTOM, (self.x, self.bottom))  # desenează țeava de jos la poziția calculată
+        return [top, bottom]
 
 
     def collide(self, bird, win):
@@ -195,31 +246,20 @@ class Pipe():
         :param bird: obiectul pasăre
         :return: Bool (True dacă există coliziune, False în caz contrar)
         """
-        # Obține măștile pentru coliziune
-        bird_mask = bird.get_mask()  # masca pasării
-        top_mask = pygame.mask.from_surface(self.PIPE_TOP)  # masca țevii de sus
-        bottom_mask = pygame.mask.from_surface(self.PIPE_BOTTOM)  # masca țevii de jos
-        
-        # Calculează offset-urile pentru verificarea coliziunii
-        top_offset = (self.x - bird.x, self.top - round(bird.y))  # offset pentru țeava de sus
-        bottom_offset = (self.x - bird.x, self.bottom - round(bird.y))  # offset pentru țeava de jos
-
-        # Verifică suprapunerea măștilor (coliziunea)
-        b_point = bird_mask.overlap(bottom_mask, bottom_offset)  # verifică coliziunea cu țeava de jos
-        t_point = bird_mask.overlap(top_mask,top_offset)  # verifică coliziunea cu țeava de sus
+        collider = get_sprites().collider  # măștile și dreptunghiurile sunt precalculate în cache
 
-        if b_point or t_point:  # dacă există coliziune cu orice țeavă
-            return True  # returnează True pentru coliziune
+        # Țeava nu poate atinge pasărea dacă nu se suprapun pe orizontală
+        if not collider.broad_phase(bird.x, [self]):
+            return False
 
-        return False  # nu există coliziune
+        # Verifică suprapunerea măștilor (coliziunea) cu țeava de sus și cu cea de jos
+        return collider.narrow_phase(bird.x, round(bird.y), bird.frame, self)
 
 class Base:
     """
     Clasa Base reprezintă podeaua în mișcare din joc
     """
     VEL = 5  # viteza de mișcare a bazei
-    WIDTH = base_img.get_width()  # lățimea imaginii bazei
-    IMG = base_img  # imaginea bazei
 
     def __init__(self, y):
         """
@@ -228,6 +268,8 @@ class Base:
         :return: None
         """
         self.y = y  # poziția y a bazei
+        self.IMG = get_image("base")  # imaginea bazei
+        self.WIDTH = self.IMG.get_width()  # lățimea imaginii bazei
         self.x1 = 0  # poziția x a primei imagini a bazei
         self.x2 = self.WIDTH  # poziția x a celei de-a doua imagini a bazei
 
@@ -251,10 +293,11 @@ class Base:
         """
         Desenează baza (două imagini care se mișcă împreună)
         :param win: fereastra pygame
-        :return: None
+        :return: dreptunghiurile desenate (listă de pygame.Rect)
         """
-        win.blit(self.IMG, (self.x1, self.y))  # desenează prima imagine a bazei
-        win.blit(self.IMG, (self.x2, self.y))  # desenează a doua imagine a bazei
+        first = win.blit(self.IMG, (self.x1, self.y))  # desenează prima imagine a bazei
+        second = win.blit(self.IMG, (self.x2, self.y))  # desenează a doua imagine a bazei
+        return [first, second]
 
 
 def blitRotateCenter(surf, image, topleft, angle):
@@ -271,55 +314,411 @@ def blitRotateCenter(surf, image, topleft, angle):
 
     surf.blit(rotated_image, new_rect.topleft)  # desenează imaginea rotită
 
+def mask_bounds(mask):
+    """
+    Calculează dreptunghiul care încadrează toți pixelii opaci ai unei măști
+    :param mask: masca pygame
+    :return: pygame.Rect
+    """
+    rects = mask.get_bounding_rects()  # dreptunghiurile componentelor opace
+    return rects[0].unionall(rects[1:])
+
+
+class SpriteCache:
+    """
+    Cache cu imaginile și măștile construite o singură dată, ca desenarea și
+    coliziunile să facă doar căutări, nu alocări în fiecare frame. Imaginile
+    rotite sunt construite abia la prima desenare (simularea headless nu le folosește)
+    """
+    TILT_STEP = 5  # înclinarea păsării ia doar valori multiple de 5 grade
+    MIN_TILT = -110  # cea mai mică înclinare posibilă (-90 minus o rotație ROT_VEL)
+
+    def __init__(self, bird_imgs, pipe_image):
+        """
+        Construiește toate imaginile și măștile
+        :param bird_imgs: imaginile pentru animația păsării (listă)
+        :param pipe_image: imaginea țevii de jos
+        :return: None
+        """
+        self.bird_imgs = bird_imgs
+        self.pipe_bottom = pipe_image  # țeava de jos (imaginea normală)
+        self.pipe_top = pygame.transform.flip(pipe_image, False, True)  # țeava de sus (imaginea întoarsă)
+
+        # Măștile pentru coliziuni
+        self.pipe_top_mask = pygame.mask.from_surface(self.pipe_top)
+        self.pipe_bottom_mask = pygame.mask.from_surface(self.pipe_bottom)
+        self.bird_masks = [pygame.mask.from_surface(img) for img in bird_imgs]
+
+        # Dreptunghiurile care încadrează pixelii opaci (pentru testul rapid de coliziune)
+        self.pipe_top_bounds = mask_bounds(self.pipe_top_mask)
+        self.pipe_bottom_bounds = mask_bounds(self.pipe_bottom_mask)
+        self.bird_bounds = np.array([tuple(mask_bounds(m)) for m in self.bird_masks])  # (x, y, w, h) pentru fiecare frame
+        self.collider = Collider(self.bird_masks, self.bird_bounds, self.pipe_top_mask, self.pipe_bottom_mask,
+                                 self.pipe_top_bounds, self.pipe_bottom_bounds)
+
+        # Imaginile rotite ale păsării, după (frame, înclinare)
+        self.rotated = {}
+
+    def _build_rotations(self):
+        """
+        Rotește fiecare imagine a păsării pentru toate înclinările posibile
+        :return: None
+        """
+        for frame, img in enumerate(self.bird_imgs):
+            for tilt in range(self.MIN_TILT, Bird.MAX_ROTATION + 1, self.TILT_STEP):
+                rotated_image = pygame.transform.rotate(img, tilt)  # rotește imaginea
+                # offset-ul față de colțul din stânga sus care păstrează centrul imaginii
+                offset = rotated_image.get_rect(center=img.get_rect().center).topleft
+                self.rotated[(frame, tilt)] = (rotated_image, offset)
+
+    def rotated_bird(self, frame, tilt):
+        """
+        Returnează imaginea rotită a păsării și offset-ul pentru desenare
+        :param frame: indexul imaginii din animație (int)
+        :param tilt: înclinarea păsării în grade
+        :return: (suprafața rotită, (dx, dy))
+        """
+        if not self.rotated:  # prima desenare
+            self._build_rotations()
+        tilt = int(round(tilt / self.TILT_STEP)) * self.TILT_STEP  # cuantizează înclinarea
+        tilt = max(self.MIN_TILT, min(Bird.MAX_ROTATION, tilt))
+        return self.rotated[(frame, tilt)]
+
+    def convert(self):
+        """
+        Convertește imaginile la formatul ferestrei (după crearea ei)
+        :return: None
+        """
+        self.pipe_bottom = self.pipe_bottom.convert_alpha()
+        self.pipe_top = self.pipe_top.convert_alpha()
+        if not self.rotated:
+            self._build_rotations()
+        for key, (rotated_image, offset) in self.rotated.items():
+            self.rotated[key] = (rotated_image.convert_alpha(), offset)
+
+
+def get_sprites():
+    """
+    Returnează cache-ul global de imagini și măști, construindu-l la prima folosire
+    :return: SpriteCache
+    """
+    global SPRITES
+    if SPRITES is None:
+        SPRITES = SpriteCache([get_image("bird" + str(x)) for x in range(1,4)], get_image("pipe"))
+    return SPRITES
+
+
+class BirdPopulation:
+    """
+    Simulează o populație întreagă de păsări cu tablouri NumPy (câte un tablou
+    pentru fiecare atribut al clasei Bird), ca un frame să fie câteva operații
+    vectoriale în loc de o buclă Python peste obiecte
+    """
+    def __init__(self, size, x=230, y=350, groups=1):
+        """
+        Inițializează toate păsările în aceeași poziție
+        :param size: numărul de păsări (int)
+        :param x: poziția x a tuturor păsărilor (int)
+        :param y: poziția inițială y (int)
+        :param groups: numărul de trasee jucate deodată; păsările sunt împărțite în grupuri
+            egale și consecutive, câte unul pentru fiecare traseu (int)
+        :return: None
+        """
+        self.size = size  # numărul de păsări
+        self.group = np.repeat(np.arange(groups), size // groups)  # traseul pe care joacă fiecare pasăre
+        self.x = x  # poziția x este aceeași pentru toate păsările
+        self.y = np.full(size, float(y))  # pozițiile y
+        self.tilt = np.zeros(size)  # înclinările în grade
+        self.tick_count = np.zeros(size)  # contoarele pentru calcularea deplasării
+        self.vel = np.zeros(size)  # vitezele
+        self.height = self.y.copy()  # înălțimile de la care s-a sărit ultima dată
+        self.img_count = np.zeros(size, dtype=np.int64)  # contoarele pentru animație
+        self.frame = np.zeros(size, dtype=np.int64)  # indexul imaginii curente din animație
+        self.alive = np.ones(size, dtype=bool)  # păsările care încă joacă
+
+    def __len__(self):
+        """
+        :return: numărul de păsări în viață
+        """
+        return int(np.count_nonzero(self.alive))
+
+    def per_bird(self, value):
+        """
+        Întinde o valoare dată pentru fiecare traseu la toate păsările
+        :param value: o valoare comună (scalar) sau câte una pentru fiecare traseu (tablou)
+        :return: valoarea comună sau tablou cu valoarea fiecărei păsări
+        """
+        return value if np.ndim(value) == 0 else value[self.group]
+
+    def jump(self, mask):
+        """
+        Face păsările selectate să sară (la fel ca Bird.jump)
+        :param mask: tablou bool cu păsările care sar
+        :return: None
+        """
+        self.vel[mask] = -10.5  # viteza negativă (în sus)
+        self.tick_count[mask] = 0  # resetează contorul de timp
+        self.height[mask] = self.y[mask]  # salvează înălțimea de la care s-a sărit
+
+    def move(self):
+        """
+        Mută toate păsările în viață cu un frame (aceleași ecuații ca Bird.move)
+        :return: None
+        """
+        a = self.alive
+        self.tick_count[a] += 1  # incrementează contoarele de timp
+        t = self.tick_count[a]
+
+        displacement = self.vel[a]*t + 0.5*(3)*t**2  # deplasarea cu accelerație
+        displacement = np.where(displacement >= 16, 16, displacement)  # viteza terminală
+        displacement = np.where(displacement < 0, displacement - 2, displacement)  # deplasare suplimentară în sus
+
+        y = self.y[a] + displacement
+        self.y[a] = y
+
+        # Înclinarea: în sus când urcă sau e aproape de înălțimea săriturii, altfel cade treptat
+        tilt = self.tilt[a]
+        up = (displacement < 0) | (y < self.height[a] + 50)
+        tilt = np.where(up, np.maximum(tilt, Bird.MAX_ROTATION),
+                        np.where(tilt > -90, tilt - Bird.ROT_VEL, tilt))
+        self.tilt[a] = tilt
+
+    def animate(self):
+        """
+        Avansează animația tuturor păsărilor în viață (la fel ca Bird.animate)
+        :return: None
+        """
+        a = self.alive
+        count = self.img_count[a] + 1
+        t = Bird.ANIMATION_TIME
+        frame = np.select([count <= t, count <= t*2, count <= t*3, count <= t*4],
+                          [0, 1, 2, 1], default=0)
+        count = np.where(count == t*4 + 1, 0, count)  # resetează animația după un ciclu complet
+
+        # Când pasărea cade brusc, nu mai animează bătaia din aripi
+        diving = self.tilt[a] <= -80
+        frame = np.where(diving, 1, frame)
+        count = np.where(diving, t*2, count)
+
+        self.img_count[a] = count
+        self.frame[a] = frame
+
+    def collide(self, pipes):
+        """
+        Verifică coliziunea tuturor păsărilor în viață cu țevile (vezi collision.Collider):
+        țevile depărtate și păsările aflate în deschidere sunt eliminate înainte de testul cu măști
+        :param pipes: lista de țevi
+        :return: (hit, gap_checks, mask_checks) - tablou bool cu păsările care s-au ciocnit și numărul
+            de verificări făcute efectiv (vezi Collider.collide)
+        """
+        hit = np.zeros(self.size, dtype=bool)
+        collider = get_sprites().collider
+        near = collider.broad_phase(self.x, pipes)  # de cele mai multe ori nicio țeavă nu e în dreptul păsărilor
+        idx = np.flatnonzero(self.alive)
+        if not near or len(idx) == 0:
+            return hit, 0, 0
+        by = np.round(self.y[idx]).astype(np.int64)  # la fel ca round(bird.y) din Pipe.collide
+        if np.ndim(near[0].top):  # mai multe trasee: fiecare pasăre vede înălțimea țevii de pe traseul ei
+            group = self.group[idx]
+            near = [PipeSpan(pipe.x, pipe.top[group], pipe.bottom[group]) for pipe in near]
+        hit[idx], gap_checks, mask_checks = collider.collide(self.x, by, self.frame[idx], near)
+        return hit, gap_checks, mask_checks
+
+    def out_of_bounds(self):
+        """
+        Verifică ce păsări au lovit podeaua sau au ieșit în sus din ecran
+        :return: tablou bool cu păsările ieșite din joc
+        """
+        height = get_sprites().bird_imgs[0].get_height()  # toate imaginile păsării au aceeași înălțime
+        return self.alive & ((self.y + height - 10 >= FLOOR) | (self.y < -50))
+
+    def kill(self, mask):
+        """
+        Scoate din joc păsările selectate
+        :param mask: tablou bool cu păsările eliminate
+        :return: None
+        """
+        self.alive &= ~mask
+
+    def draw(self, win, indices=None):
+        """
+        Desenează păsările în viață
+        :param win: fereastra pygame sau suprafață
+        :param indices: păsările de desenat (tablou de indici sau None = toate cele în viață)
+        :return: dreptunghiurile desenate (listă de pygame.Rect)
+        """
+        sprites = get_sprites()
+        rects = []
+        for i in (np.flatnonzero(self.alive) if indices is None else indices):
+            rotated_image, offset = sprites.rotated_bird(self.frame[i], self.tilt[i])
+            rects.append(win.blit(rotated_image, (self.x + offset[0], self.y[i] + offset[1])))  # păstrează centrul imaginii pe loc
+        return rects
+
+
+def get_window():
+    """
+    Creează fereastra pygame la prima randare și o returnează
+    :return: suprafața ferestrei
+    """
+    global WIN, STAT_FONT, END_FONT
+    if WIN is None:  # fereastra nu a fost încă creată
+        WIN = pygame.display.set_mode((WIN_WIDTH, WIN_HEIGHT))  # creează fereastra jocului
+        pygame.display.set_caption("Flappy Bird")  # setează titlul ferestrei
+
+        pygame.font.init()  # initializează fonturile în pygame
+        STAT_FONT = pygame.font.SysFont("comicsans", 50)  # fontul pentru statistici
+        END_FONT = pygame.font.SysFont("comicsans", 70)  # fontul pentru mesajul de final
+
+        # Convertește imaginile la formatul ferestrei pentru o desenare mai rapidă
+        set_image("bg", get_image("bg").convert_alpha())
+        set_image("base", get_image("base").convert_alpha())
+        get_sprites().convert()
+    return WIN
+
+
+class Renderer:
+    """
+    Desenează fereastra incremental. Fundalul nu se schimbă, deci la fiecare
+    frame se reface fundalul doar acolo unde s-a desenat în frame-ul anterior,
+    se desenează țevile, baza și păsările, iar pe ecran se actualizează doar
+    dreptunghiurile modificate. Textele sunt randate din nou doar când li se
+    schimbă valoarea. Rezultatul este identic cu redesenarea completă
+    """
+
+    def __init__(self):
+        """
+        Creează un renderer care desenează complet primul frame
+        :return: None
+        """
+        self.win = None  # suprafața pe care s-a desenat ultima dată
+        self.dirty = []  # dreptunghiurile desenate în frame-ul anterior (de șters în frame-ul curent)
+        self.labels = {}  # locul textului -> (textul, suprafața, dreptunghiul)
+
+    def invalidate(self):
+        """
+        Forțează desenarea completă a următorului frame (de exemplu după ce altcineva a desenat în fereastră)
+        :return: None
+        """
+        self.win = None
+
+    def label(self, slot, text, pos):
+        """
+        Returnează textul randat pentru un loc din fereastră, randându-l din nou doar dacă s-a schimbat
+        :param slot: numele locului (str)
+        :param text: textul (str)
+        :param pos: funcție care primește lățimea textului și returnează poziția lui
+        :return: (suprafața, dreptunghiul, dreptunghiul vechi dacă textul s-a schimbat sau None)
+        """
+        old = self.labels.get(slot)
+        if old is not None and old[0] == text:
+            return old[1], old[2], None
+        surface = STAT_FONT.render(text, 1, (255,255,255))
+        rect = surface.get_rect(topleft=pos(surface.get_width()))
+        self.labels[slot] = (text, surface, rect)
+        return surface, rect, old[2] if old is not None else None
+
+    def draw(self, win, birds, pipes, base, score, gen, pipe_ind, top=None):
+        """
+        Desenează un frame (aceiași parametri ca draw_window)
+        :param top: desenează cel mult top păsări în viață (int sau None = toate)
+        :return: None
+        """
+        full = win is not self.win  # primul frame (sau o fereastră nouă) se desenează complet
+        self.win = win
+        bg = get_image("bg")
+
+        labels = [  # textele cu scorul, generația și numărul de păsări în viață
+            self.label("score", "Score: " + str(score), lambda w: (WIN_WIDTH - w - 15, 10)),  # colțul din dreapta sus
+            self.label("gen", "Gens: " + str(gen-1), lambda w: (10, 10)),  # colțul din stânga sus
+            self.label("alive", "Alive: " + str(len(birds)), lambda w: (10, 50)),  # sub generație
+        ]
+
+        # Reface fundalul sub tot ce s-a mișcat și sub textele schimbate
+        erase = [] if full else self.dirty + [old for _, _, old in labels if old is not None]
+        if full:
+            win.blit(bg, (0,0))
+        for rect in erase:
+            win.blit(bg, rect, rect)
+
+        # Păsările desenate: toate cele în viață sau primele top dintre ele. Păsările în viață au
+        # toate același fitness (aceleași frame-uri și aceleași țevi), deci nu există o ordine după fitness
+        indices = np.flatnonzero(birds.alive)
+        if top is not None:
+            indices = indices[:top]
+
+        drawn = self.draw_scene(win, birds, pipes, base, pipe_ind, indices)
+
+        # Textele sunt deasupra tuturor, deci se desenează din nou și când au fost acoperite sau șterse.
+        # Un text nu se poate desena peste el însuși (marginile netezite s-ar îngroșa), așa că zona
+        # lui este refăcută întâi: fundalul și scena, desenate doar în dreptunghiul textului
+        changed = erase + drawn
+        for surface, rect, old in labels:
+            if full or old is not None:
+                win.blit(surface, rect)
+                changed.append(rect)
+            elif rect.collidelist(changed) != -1:
+                win.set_clip(rect)
+                win.blit(bg, rect, rect)
+                self.draw_scene(win, birds, pipes, base, pipe_ind, indices)
+                win.set_clip(None)
+                win.blit(surface, rect)
+                changed.append(rect)
+
+        if full:
+            pygame.display.update()  # actualizează tot afișajul
+        else:
+            pygame.display.update(changed)  # actualizează doar zonele modificate
+        self.dirty = drawn
+
+    def draw_scene(self, win, birds, pipes, base, pipe_ind, indices):
+        """
+        Desenează tot ce se mișcă: țevile, baza, liniile și păsările
+        :param win: suprafața pygame
+        :param birds: populația de păsări (BirdPopulation)
+        :param pipes: lista de țevi
+        :param base: baza
+        :param pipe_ind: indexul celei mai apropiate țevi
+        :param indices: păsările de desenat (tablou de indici)
+        :return: dreptunghiurile desenate (listă de pygame.Rect)
+        """
+        drawn = []
+        for pipe in pipes:  # desenează toate țevile
+            drawn += pipe.draw(win)
+        drawn += base.draw(win)  # desenează baza în mișcare
+
+        # Desenează liniile de la păsări la țeavă (pentru vizualizarea rețelei neuronale)
+        if DRAW_LINES and pipe_ind < len(pipes):
+            pipe = pipes[pipe_ind]
+            bird_w, bird_h = get_sprites().bird_imgs[0].get_size()  # dimensiunile imaginii păsării
+            for y in birds.y[indices]:
+                start = (birds.x+bird_w/2, y + bird_h/2)
+                drawn.append(pygame.draw.line(win, (255,0,0), start, (pipe.x + pipe.PIPE_TOP.get_width()/2, pipe.height), 5))
+                drawn.append(pygame.draw.line(win, (255,0,0), start, (pipe.x + pipe.PIPE_BOTTOM.get_width()/2, pipe.bottom), 5))
+
+        # Toate păsările sunt pe aceeași coloană, deci un singur dreptunghi le încadrează
+        bird_rects = birds.draw(win, indices)
+        if bird_rects:
+            drawn.append(bird_rects[0].unionall(bird_rects[1:]))
+        return drawn
+
+
 def draw_window(win, birds, pipes, base, score, gen, pipe_ind):
     """
     Desenează fereastra pentru bucla principală a jocului
     :param win: suprafața pygame
-    :param birds: lista de păsări
+    :param birds: populația de păsări (BirdPopulation)
     :param pipes: lista de țevi
     :param score: scorul jocului (int)
     :param gen: generația curentă
     :param pipe_ind: indexul celei mai apropiate țevi
     :return: None
     """
+    global RENDERER
     if gen == 0:  # asigură că generația nu este 0 pentru afișare
         gen = 1
-    win.blit(bg_img, (0,0))  # desenează fundalul
-
-    # Desenează toate țevile
-    for pipe in pipes:  # pentru fiecare țeavă din lista de țevi
-        pipe.draw(win)  # desenează țeava
-
-    # Desenează baza
-    base.draw(win)  # desenează baza în mișcare
-    
-    # Desenează toate păsările
-    for bird in birds:  # pentru fiecare pasăre din lista de păsări
-        # Desenează liniile de la pasăre la țeavă (pentru vizualizarea rețelei neuronale)
-        if DRAW_LINES:  # dacă opțiunea de desenare a liniilor este activată
-            try:
-                # Desenează o linie de la pasăre la partea de sus a țevii
-                pygame.draw.line(win, (255,0,0), (bird.x+bird.img.get_width()/2, bird.y + bird.img.get_height()/2), (pipes[pipe_ind].x + pipes[pipe_ind].PIPE_TOP.get_width()/2, pipes[pipe_ind].height), 5)
-                # Desenează o linie de la pasăre la partea de jos a țevii
-                pygame.draw.line(win, (255,0,0), (bird.x+bird.img.get_width()/2, bird.y + bird.img.get_height()/2), (pipes[pipe_ind].x + pipes[pipe_ind].PIPE_BOTTOM.get_width()/2, pipes[pipe_ind].bottom), 5)
-            except:
-                pass  # ignoră erorile (de exemplu, dacă nu există țevi)
-        # Desenează pasărea
-        bird.draw(win)  # desenează pasărea
-
-    # Desenează scorul
-    score_label = STAT_FONT.render("Score: " + str(score),1,(255,255,255))  # creează textul pentru scor
-    win.blit(score_label, (WIN_WIDTH - score_label.get_width() - 15, 10))  # desenează scorul în colțul din dreapta sus
-
-    # Desenează generația
-    score_label = STAT_FONT.render("Gens: " + str(gen-1),1,(255,255,255))  # creează textul pentru generație
-    win.blit(score_label, (10, 10))  # desenează generația în colțul din stânga sus
-
-    # Desenează numărul de păsări în viață
-    score_label = STAT_FONT.render("Alive: " + str(len(birds)),1,(255,255,255))  # creează textul pentru numărul de păsări în viață
-    win.blit(score_label, (10, 50))  # desenează numărul de păsări în viață sub generație
-
-    pygame.display.update()  # actualizează afișajul
+    if RENDERER is None:
+        RENDERER = Renderer()
+    RENDERER.draw(win, birds, pipes, base, score, gen, pipe_ind, DRAW_TOP)
 
 
 def eval_genomes(genomes, config):
@@ -327,128 +726,440 @@ def eval_genomes(genomes, config):
     Execută simularea populației curente de păsări și setează
     fitness-ul lor în funcție de distanța pe care o parcurg în joc.
     """
-    global WIN, gen  # folosește variabilele globale
-    win = WIN  # fereastra jocului
+    global gen, LAST_STOP  # folosește variabilele globale
     gen += 1  # incrementează generația
-
-    # Începe prin crearea listelor care conțin genomul în sine,
-    # rețeaua neuronală asociată genomului și obiectul pasăre
-    # care folosește acea rețea pentru a juca
-    nets = []  # lista pentru rețelele neuronale
-    birds = []  # lista pentru păsări
-    ge = []  # lista pentru genomuri
-    for genome_id, genome in genomes:  # pentru fiecare genom din generația curentă
-        genome.fitness = 0  # începe cu un nivel de fitness 0
-        net = neat.nn.FeedForwardNetwork.create(genome, config)  # creează rețeaua neuronală din genom
-        nets.append(net)  # adaugă rețeaua la listă
-        birds.append(Bird(230,350))  # creează o pasăre și o adaugă la listă
-        ge.append(genome)  # adaugă genomul la listă
-
-    base = Base(FLOOR)  # creează baza jocului
-    pipes = [Pipe(700)]  # creează prima țeavă
+    LAST_STOP = None
+    COUNTERS.clear()  # statisticile simulării sunt pentru generația curentă (vezi generation_stats)
+    ALIVE.clear()
+
+    # Decide dacă această generație se desenează. În modul headless nu se creează
+    # fereastra, nu se limitează FPS-ul și nu se randează nimic, dar fizica și
+    # coliziunile sunt identice, deci fitness-ul este același pentru aceeași sămânță
+    render = not HEADLESS or (RENDER_EVERY > 0 and gen % RENDER_EVERY == 0)
+    record = REPLAY_DIR is not None  # înregistrează jocul pe primul traseu
+
+    # Limitele generației; timpul se măsoară de la începutul evaluării
+    limits = None
+    if any(limit is not None for limit in (MAX_FRAMES, MAX_SCORE, TIME_BUDGET, EARLY_CUTOFF)):
+        limits = game_limits.GenerationLimits(MAX_FRAMES, MAX_SCORE, TIME_BUDGET, EARLY_CUTOFF)
+        limits.start()
+
+    # Toate păsările generației (și toate procesele) joacă pe aceleași trasee
+    seed = COURSE_SEED if COURSE_SEED is not None else random.getrandbits(32)
+    seeds = course.course_seeds(seed, COURSES)
+
+    ge = [genome for genome_id, genome in genomes]  # lista pentru genomuri
+    fitness = np.full(len(ge), np.nan)  # NaN = încă neevaluat
+
+    # Genomurile deja evaluate pe aceleași trasee (de exemplu elitele) își iau fitness-ul din cache.
+    # Generațiile desenate sau înregistrate simulează totuși toate păsările, ca să fie afișate.
+    # Cu limita de timp sau cu oprirea timpurie, fitness-ul depinde de restul populației, deci nu se memorează
+    keys = []
+    cache = FITNESS_CACHE if TIME_BUDGET is None and EARLY_CUTOFF is None else None
+    if cache is not None:
+        keys = [genome_key(genome, seeds, (MAX_FRAMES, MAX_SCORE)) for genome in ge]
+        if not (render or record):
+            for i, key in enumerate(keys):
+                value = cache.get(key)
+                if value is not None:
+                    fitness[i] = value
+
+    todo = np.flatnonzero(np.isnan(fitness))  # genomurile care trebuie simulate
+    if len(todo):
+        courses = [course.get_course(s) for s in seeds]
+        fitness[todo], replay, LAST_STOP = evaluate_courses([ge[i] for i in todo], config, courses,
+                                                            render, record, limits)
+        if replay is not None:
+            replay.generation = gen
+            replay.save(os.path.join(REPLAY_DIR, "gen-{:04d}.npz".format(gen)))
+        if cache is not None:
+            cache.put((keys[i], fitness[i]) for i in todo)
+        if LAST_STOP is not None and LAST_STOP[0] != game_limits.EXTINCT:
+            print("Generația s-a oprit la frame-ul {1}: {0}".format(*LAST_STOP))
+
+    for genome, value in zip(ge, fitness):  # scrie fitness-ul final în genomuri
+        genome.fitness = float(value)
+
+
+def evaluate_courses(genomes, config, courses, render=False, record=False, limits=None):
+    """
+    Evaluează genomurile pe mai multe trasee (în paralel dacă există EVALUATOR).
+    Traseele sunt jucate deodată (vezi simulate), în afară de primul, care se
+    joacă separat când este desenat sau înregistrat
+    :param genomes: lista de genomuri
+    :param config: configurația NEAT
+    :param courses: lista de trasee (course.Course)
+    :param render: desenează primul traseu în fereastră (bool)
+    :param record: înregistrează jocul de pe primul traseu (bool)
+    :param limits: limitele generației (limits.GenerationLimits sau None)
+    :return: (tablou cu fitness-ul mediu al fiecărui genom în aceeași ordine, Replay sau None,
+        (motivul opririi, frame-uri) sau None fără limite)
+    """
+    groups = [courses]  # traseele jucate împreună
+    if (render or record) and len(courses) > 1:
+        groups = [courses[:1], courses[1:]]
+
+    fitness = np.zeros(len(genomes))
+    replay = None
+    stop = None
+    done = 0  # traseele jucate
+    for k, group in enumerate(groups):  # fitness-ul este media pe toate traseele
+        first = k == 0  # se desenează și se înregistrează doar primul traseu
+        track = group[0] if len(group) == 1 else group
+        if EVALUATOR is not None and not (render and first):  # împarte genomurile între procese
+            values, chunk_replays, stops, counters, phases = EVALUATOR.evaluate(genomes, track, record and first,
+                                                                                limits)
+            if chunk_replays:
+                replay = Replay.concat(chunk_replays)
+            for chunk_counters, chunk_alive in counters:  # statisticile proceselor de lucru
+                COUNTERS.update(chunk_counters)
+                ALIVE.update(chunk_alive)
+            if PROFILER is not None:  # timpii pe faze măsurați în procesele de lucru
+                for times, calls in phases:
+                    PROFILER.merge(times, calls)
+        else:
+            recorder = ReplayRecorder(len(genomes), track.seed) if record and first else None
+            values = simulate(genomes, config, track, render and first, recorder=recorder, limits=limits)
+            if recorder is not None:
+                replay = recorder.replay(values)
+            stops = [(limits.reason, limits.frames, values.max())] if limits is not None else []
+
+        if stops:  # păsările oprite de o limită primesc toate același fitness, pe toate grupurile
+            values, reason, frames = game_limits.cap_fitness(values, stops)
+            if stop is None or stop[0] == game_limits.EXTINCT:  # se raportează prima limită atinsă
+                stop = (reason, frames)
+            if replay is not None and first:  # înregistrarea păstrează același clasament ca genomurile
+                replay.fitness = values
+        for row in values.reshape(len(group), len(genomes)):  # adunate în ordinea traseelor
+            fitness += row
+        done += len(group)
+        if limits is not None and limits.expired() and done < len(courses):
+            stop = (game_limits.TIME_BUDGET, stop[1])  # traseele rămase nu mai încap în timpul generației
+            break
+    return fitness / done, replay, stop
+
+
+def simulate(genomes, config, track, render=False, max_frames=None, recorder=None, limits=None, profiler=None):
+    """
+    Joacă un joc cu câte o pasăre pentru fiecare genom și calculează fitness-ul.
+    Fitness-ul unei păsări depinde doar de rețeaua ei și de traseu, deci
+    genomurile pot fi împărțite între procese fără ca rezultatul să se schimbe.
+    Toate traseele au țevile la aceleași momente (doar înălțimile diferă), deci
+    mai multe trasee pot fi jucate deodată: fiecare genom are câte o pasăre pe
+    fiecare traseu, iar toate păsările sunt mișcate și evaluate împreună
+    :param genomes: lista de genomuri
+    :param config: configurația NEAT
+    :param track: traseul jocului (course.Course) sau lista de trasee jucate deodată
+    :param render: desenează jocul în fereastră (bool)
+    :param max_frames: oprește jocul după acest număr de frame-uri (int sau None)
+    :param recorder: ReplayRecorder care înregistrează săriturile și morțile (None = fără înregistrare)
+    :param limits: limitele generației; la final, limits.reason și limits.frames spun de ce și când
+        s-a oprit jocul (limits.GenerationLimits sau None)
+    :param profiler: cronometrul fazelor (profiling.PhaseTimer); None = PROFILER
+    :return: tablou cu fitness-ul fiecărui genom, în aceeași ordine; pentru o listă de trasee,
+        tablou de forma (trasee, genomuri)
+    """
+    single = not isinstance(track, list)
+    tracks = [track] if single else track
+    if len(tracks) > 1 and (render or recorder is not None):
+        raise ValueError("Doar un singur traseu poate fi desenat sau înregistrat")
+    pipe_height = track.height if single else (lambda index: course.heights(tracks, index))
+
+    win = get_window() if render else None  # fereastra jocului (doar dacă se desenează)
+
+    # Începe prin crearea listei cu rețelele neuronale asociate genomurilor.
+    # Păsările sunt simulate împreună de BirdPopulation; pe fiecare traseu, pasărea i folosește rețeaua i
+    nets = [neat.nn.FeedForwardNetwork.create(genome, config) for genome in genomes]  # creează rețelele neuronale
+    batch = BatchNetwork(nets)  # toate rețelele compilate pentru evaluare într-un singur apel
+    birds = BirdPopulation(len(nets) * len(tracks), 230, 350, len(tracks))  # creează toate păsările
+    fitness = np.zeros(birds.size)  # fitness-ul acumulat al fiecărei păsări
+
+    base = Base(FLOOR) if render else None  # creează baza jocului (doar decor, nu contează fără fereastră)
+    pipes = [Pipe(700, pipe_height(0))]  # creează prima țeavă
+    pipe_count = 1  # numărul de țevi create (indexul următoarei țevi din traseu)
     score = 0  # inițializează scorul
 
     clock = pygame.time.Clock()  # creează un ceas pentru controlul FPS
 
+    prof = profiler if profiler is not None else PROFILER  # cronometrul fazelor (None = fără măsurare)
+
+    frames = 0  # numărul de frame-uri jucate
+    if limits is not None:
+        limits.reason = game_limits.EXTINCT  # fără altă limită, jocul se termină când mor toate păsările
     run = True  # flag pentru bucla principală
     while run and len(birds) > 0:  # cât timp jocul rulează și există păsări în viață
-        clock.tick(30)  # limitează FPS-ul la 30
-
-        for event in pygame.event.get():  # verifică evenimentele pygame
-            if event.type == pygame.QUIT:  # dacă utilizatorul închide fereastra
-                run = False  # oprește bucla
-                pygame.quit()  # închide pygame
-                quit()  # închide programul
-                break
+        if max_frames is not None and frames >= max_frames:  # limita de frame-uri a fost atinsă
+            break
+        frames += 1
+        if prof: t = prof.start()
+
+        if render:  # limita de FPS și evenimentele contează doar când există fereastră
+            clock.tick(30)  # limitează FPS-ul la 30
+
+            for event in pygame.event.get():  # verifică evenimentele pygame
+                if event.type == pygame.QUIT:  # dacă utilizatorul închide fereastra
+                    run = False  # oprește bucla
+                    pygame.quit()  # închide pygame
+                    quit()  # închide programul
+                    break
+            if prof: t = prof.record("frame_wait", t)
 
         pipe_ind = 0  # indexul țevii care este urmărită
-        if len(birds) > 0:  # dacă există păsări în viață
-            # Determină dacă să folosească prima sau a doua țeavă de pe ecran pentru intrarea în rețeaua neuronală
-            if len(pipes) > 1 and birds[0].x > pipes[0].x + pipes[0].PIPE_TOP.get_width():
-                pipe_ind = 1  # folosește a doua țeavă dacă prima a fost depășită
-
-        for x, bird in enumerate(birds):  # dă fiecărei păsări un fitness de 0.1 pentru fiecare frame în care rămâne în viață
-            ge[x].fitness += 0.1  # crește fitness-ul genomului
-            bird.move()  # mișcă pasărea
-
-            # Trimite poziția păsării, poziția țevii de sus și a celei de jos și determină din rețea dacă să sară sau nu
-            output = nets[birds.index(bird)].activate((bird.y, abs(bird.y - pipes[pipe_ind].height), abs(bird.y - pipes[pipe_ind].bottom)))
-
-            if output[0] > 0.5:  # folosim o funcție de activare tanh, deci rezultatul va fi între -1 și 1. Dacă este peste 0.5, sare
-                bird.jump()  # face pasărea să sară
-
-        base.move()  # mișcă baza
+        # Determină dacă să folosească prima sau a doua țeavă de pe ecran pentru intrarea în rețeaua neuronală
+        if len(pipes) > 1 and birds.x > pipes[0].x + pipes[0].PIPE_TOP.get_width():
+            pipe_ind = 1  # folosește a doua țeavă dacă prima a fost depășită
+
+        alive = len(birds)  # numărul de păsări în viață la începutul frame-ului
+        ALIVE[frames - 1] += alive
+        COUNTERS["frames"] += 1
+        COUNTERS["bird_steps"] += alive
+        COUNTERS["activations"] += alive
+
+        # Dă fiecărei păsări în viață un fitness de 0.1 pentru fiecare frame și mișcă păsările
+        fitness[birds.alive] += 0.1
+        birds.move()
+        if prof: t = prof.record("physics", t)
+
+        # Trimite poziția păsărilor, poziția țevii de sus și a celei de jos și determină din rețele care sar
+        pipe = pipes[pipe_ind]
+        inputs = np.column_stack((birds.y, np.abs(birds.y - birds.per_bird(pipe.height)),
+                                  np.abs(birds.y - birds.per_bird(pipe.bottom))))
+        output = batch.activate(inputs.reshape(len(tracks), len(nets), -1))[..., 0].ravel()  # câte un set pe traseu
+        # folosim o funcție de activare tanh, deci rezultatul va fi între -1 și 1. Dacă este peste 0.5, sare
+        jump = birds.alive & (output > 0.5)
+        birds.jump(jump)  # face păsările alese să sară
+        if recorder is not None:
+            recorder.record_frame(jump)
+        if prof: t = prof.record("inference", t)
+
+        if base is not None:
+            base.move()  # mișcă baza
 
         rem = []  # lista pentru țevile de eliminat
         add_pipe = False  # flag pentru adăugarea unei noi țevi
         for pipe in pipes:  # pentru fiecare țeavă
             pipe.move()  # mișcă țeava
-            # Verifică coliziunea
-            for bird in birds:  # pentru fiecare pasăre
-                if pipe.collide(bird, win):  # dacă pasărea se ciocnește cu țeava
-                    ge[birds.index(bird)].fitness -= 1  # penalizează genomul
-                    nets.pop(birds.index(bird))  # elimină rețeaua
-                    ge.pop(birds.index(bird))  # elimină genomul
-                    birds.pop(birds.index(bird))  # elimină pasărea
 
             if pipe.x + pipe.PIPE_TOP.get_width() < 0:  # dacă țeava a ieșit complet din ecran
                 rem.append(pipe)  # marchează țeava pentru eliminare
 
-            if not pipe.passed and pipe.x < bird.x:  # dacă pasărea a trecut de țeavă
+            if not pipe.passed and pipe.x < birds.x:  # dacă păsările au trecut de țeavă
                 pipe.passed = True  # marchează țeava ca fiind depășită
                 add_pipe = True  # setează flagul pentru adăugarea unei noi țevi
 
+        # Verifică coliziunea tuturor păsărilor cu toate țevile deodată
+        hit, gap_checks, mask_checks = birds.collide(pipes)
+        COUNTERS["gap_checks"] += gap_checks  # numai verificările făcute efectiv, nu perechile pasăre-țeavă
+        COUNTERS["mask_checks"] += mask_checks
+        COUNTERS["collision_checks"] += gap_checks + mask_checks
+        fitness[hit] -= 1  # penalizează genomurile
+        birds.kill(hit)  # elimină păsările
+        if recorder is not None:
+            recorder.record_deaths(hit, frames - 1)
+        if prof: t = prof.record("collision", t)
+
         if add_pipe:  # dacă trebuie adăugată o nouă țeavă
             score += 1  # crește scorul
             # Poate adăuga această linie pentru a oferi mai multă recompensă pentru trecerea printr-o țeavă (nu este obligatoriu)
-            for genome in ge:  # pentru fiecare genom
-                genome.fitness += 5  # crește fitness-ul cu 5
-            pipes.append(Pipe(WIN_WIDTH))  # adaugă o nouă țeavă
+            fitness[birds.alive] += 5  # crește fitness-ul cu 5
+            pipes.append(Pipe(WIN_WIDTH, pipe_height(pipe_count)))  # adaugă o nouă țeavă
+            pipe_count += 1
 
         for r in rem:  # pentru fiecare țeavă de eliminat
             pipes.remove(r)  # elimină țeava din listă
 
-        for bird in birds:  # pentru fiecare pasăre
-            # Verifică dacă pasărea a lovit podeaua sau a ieșit în sus din ecran
-            if bird.y + bird.img.get_height() - 10 >= FLOOR or bird.y < -50:
-                nets.pop(birds.index(bird))  # elimină rețeaua
-                ge.pop(birds.index(bird))  # elimină genomul
-                birds.pop(birds.index(bird))  # elimină pasărea
+        # Elimină păsările care au lovit podeaua sau au ieșit în sus din ecran
+        out = birds.out_of_bounds()
+        birds.kill(out)
+        if recorder is not None:
+            recorder.record_deaths(out, frames - 1)
+        if prof: t = prof.record("culling", t)
+
+        birds.animate()  # avansează animația (imaginea curentă este folosită și la coliziuni)
+        if prof: t = prof.record("animation", t)
+
+        if render:  # desenează doar generațiile alese pentru afișare
+            draw_window(win, birds, pipes, base, score, gen, pipe_ind)  # desenează fereastra jocului
+            if prof: t = prof.record("rendering", t)
+
+        # Oprește dacă s-a atins o limită a generației (de exemplu un scor suficient de mare).
+        # Păsările rămase au toate același fitness, cel de la oprire
+        if limits is not None:
+            limits.frames = frames
+            lead = float("inf")
+            if limits.cutoff is not None and 0 < len(birds) <= limits.cutoff:  # calculat doar spre final
+                lead = game_limits.survivor_lead(fitness, birds.alive)
+            reason = limits.check(frames, score, len(birds), lead)
+            if reason is not None:
+                limits.reason = reason
+                break
+
+    return fitness if single else fitness.reshape(len(tracks), len(nets))
 
-        draw_window(WIN, birds, pipes, base, score, gen, pipe_ind)  # desenează fereastra jocului
 
-        # Oprește dacă scorul devine suficient de mare
-        '''if score > 20:
-            pickle.dump(nets[0],open("best.pickle", "wb"))
-            break'''
+def take_counters():
+    """
+    Returnează contoarele simulării din procesul curent și le golește. Procesele
+    de lucru le trimit astfel procesului principal după fiecare grup de genomuri
+    :return: (COUNTERS, ALIVE), copii
+    """
+    counters = (COUNTERS.copy(), ALIVE.copy())
+    COUNTERS.clear()
+    ALIVE.clear()
+    return counters
 
 
-def run(config_file):
+def generation_stats():
+    """
+    Statisticile simulării pentru ultima generație, pentru telemetrie
+    :return: dicționar serializabil JSON
+    """
+    frames = max(ALIVE) + 1 if ALIVE else 0  # cel mai lung joc al generației
+    step = max(1, -(-frames // ALIVE_POINTS))  # curba are cel mult ALIVE_POINTS puncte
+    return {
+        "frames": frames,
+        "bird_steps": COUNTERS["bird_steps"],
+        "activations": COUNTERS["activations"],
+        "collision_checks": COUNTERS["collision_checks"],
+        "gap_checks": COUNTERS["gap_checks"],
+        "mask_checks": COUNTERS["mask_checks"],
+        "alive_curve": [ALIVE[f] for f in range(0, frames, step)],
+        "alive_curve_step": step,
+        "stop_reason": LAST_STOP[0] if LAST_STOP is not None else None,
+    }
+
+
+def run(config_file, headless=False, render_every=0, seed=None, generations=50, workers=1,
+        course_seed=None, courses=1, cache_size=0, cache_file=None, profile_file=None,
+        checkpoint_dir=None, checkpoint_every=5, checkpoint_minutes=None, resume=False, winner_file=None,
+        replay_dir=None, draw_top=None, max_frames=None, max_score=None, time_budget=None, early_cutoff=None,
+        telemetry=None):
     """
     Execută algoritmul NEAT pentru a antrena o rețea neuronală să joace Flappy Bird
     :param config_file: locația fișierului de configurare
-    :return: None
+    :param headless: rulează fără fereastră și fără limită de FPS (bool)
+    :param render_every: în modul headless, desenează fiecare a N-a generație (int, 0 = niciodată)
+    :param seed: sămânța pentru generatorul aleator, pentru rulări reproductibile (int sau None)
+    :param generations: numărul maxim de generații (int)
+    :param workers: numărul de procese pentru evaluarea genomurilor (int, 1 = fără procese)
+    :param course_seed: sămânța traseelor fixe, aceleași la fiecare generație (int sau None)
+    :param courses: numărul de trasee pe care este evaluat fiecare genom (int)
+    :param cache_size: numărul de genomuri păstrate în cache-ul de fitness (int, 0 = fără cache)
+    :param cache_file: fișierul în care cache-ul de fitness este păstrat pe disc (str sau None)
+    :param profile_file: fișierul CSV pentru timpii pe faze ai buclei de joc (str sau None = fără măsurare)
+    :param checkpoint_dir: directorul pentru checkpoint-uri (str sau None = fără checkpoint-uri)
+    :param checkpoint_every: salvează un checkpoint la fiecare N generații (int sau None)
+    :param checkpoint_minutes: salvează un checkpoint după cel mult atâtea minute (float sau None)
+    :param resume: continuă din cel mai recent checkpoint din checkpoint_dir (bool)
+    :param winner_file: fișierul în care se salvează cel mai bun genom și rețeaua lui (str sau None)
+    :param replay_dir: directorul în care se înregistrează fiecare generație, pentru playback.py (str sau None)
+    :param draw_top: desenează cel mult N păsări în viață (int sau None = toate)
+    :param max_frames: numărul maxim de frame-uri pe traseu într-o generație (int sau None)
+    :param max_score: scorul la care se oprește jocul unei generații (int sau None)
+    :param time_budget: timpul maxim al unei generații, în secunde (float sau None)
+    :param early_cutoff: oprește jocul când rămân în viață cel mult atâtea păsări (int sau None);
+        nu poate fi folosit cu workers > 1 sau courses > 1
+    :param telemetry: unde se trimit statisticile fiecărei generații în format NDJSON: un fișier,
+        "tcp://host:port" sau "unix:///cale/socket" (str sau None)
+    :return: (cel mai bun genom, neat.StatisticsReporter cu istoricul generațiilor)
     """
+    global HEADLESS, RENDER_EVERY, EVALUATOR, COURSE_SEED, COURSES, FITNESS_CACHE, PROFILER, REPLAY_DIR, DRAW_TOP, gen
+    global MAX_FRAMES, MAX_SCORE, TIME_BUDGET, EARLY_CUTOFF
+    if early_cutoff is not None and (workers > 1 or courses > 1):
+        # Fiecare proces vede doar o parte din populație, iar media pe mai multe trasee se poate schimba
+        # și după oprire, deci clasamentul nu ar mai fi același ca fără oprire
+        raise ValueError("early_cutoff funcționează doar cu un singur proces și un singur traseu")
+    HEADLESS = headless  # setează modul de rulare pentru eval_genomes
+    RENDER_EVERY = render_every
+    COURSE_SEED = course_seed
+    COURSES = courses
+    REPLAY_DIR = replay_dir
+    DRAW_TOP = draw_top
+    MAX_FRAMES = max_frames
+    MAX_SCORE = max_score
+    TIME_BUDGET = time_budget
+    EARLY_CUTOFF = early_cutoff
+    if replay_dir is not None:
+        os.makedirs(replay_dir, exist_ok=True)
+    if seed is not None:  # aceeași sămânță dă aceleași țevi și aceleași mutații
+        random.seed(seed)
+
     # Încarcă configurația NEAT
     config = neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction,
                          neat.DefaultSpeciesSet, neat.DefaultStagnation,
                          config_file)  # încarcă configurația din fișier
 
-    # Creează populația, care este obiectul de nivel superior pentru o execuție NEAT
-    p = neat.Population(config)  # creează populația inițială
+    # Creează populația, care este obiectul de nivel superior pentru o execuție NEAT,
+    # sau o reface din ultimul checkpoint (împreună cu generatorul aleator și generația)
+    path = checkpoint.latest_checkpoint(checkpoint_dir) if resume and checkpoint_dir else None
+    if path is not None:
+        print("Continui din checkpoint-ul {}".format(path))
+        p, state = checkpoint.restore_checkpoint(path)
+        config = p.config  # configurația cu care a fost pornită rularea
+        gen = state.get("gen", p.generation)
+        p.best_genome = state.get("best_genome")  # neat nu salvează cel mai bun genom de până acum
+        generations = max(generations - p.generation, 0)  # generațiile rămase
+    else:
+        p = neat.Population(config)  # creează populația inițială
 
     # Adaugă un reporter stdout pentru a arăta progresul în terminal
     p.add_reporter(neat.StdOutReporter(True))  # adaugă reporter pentru terminal
     stats = neat.StatisticsReporter()  # creează un reporter de statistici
     p.add_reporter(stats)  # adaugă reporterul de statistici
-    #p.add_reporter(neat.Checkpointer(5))  # adaugă un punct de control (comentat)
-
-    # Rulează pentru maximum 50 de generații
-    winner = p.run(eval_genomes, 50)  # execută evaluarea genomurilor pentru 50 de generații
+    checkpointer = None
+    if checkpoint_dir is not None:  # salvează periodic starea antrenării
+        checkpointer = checkpoint.Checkpointer(checkpoint_dir, checkpoint_every,
+                                               checkpoint_minutes * 60 if checkpoint_minutes else None,
+                                               state_func=lambda: {"gen": gen, "best_genome": p.best_genome})
+        if path is not None:  # numără generațiile de la checkpoint-ul din care s-a continuat
+            checkpointer.last_generation = p.generation - 1
+        p.add_reporter(checkpointer)
+    profiler = None
+    if profile_file is not None:  # măsoară timpul fiecărei faze a buclei de joc
+        profiler = ProfilingReporter()
+        p.add_reporter(profiler)
+        PROFILER = profiler.timer
+    reporter = None
+    if telemetry is not None:  # trimite statisticile fiecărei generații către un fișier sau un socket
+        reporter = TelemetryReporter(telemetry, stats_func=generation_stats)
+        p.add_reporter(reporter)
+
+    # Procesele sunt pornite o singură dată și rămân active pe toată durata rulării
+    if workers > 1:
+        EVALUATOR = ParallelEvaluator(workers, simulate, config, take_counters, profile=profiler is not None)
+
+    # Cache-ul de fitness are sens mai ales cu trasee fixe (course_seed), altfel traseele diferă la fiecare generație
+    if cache_size > 0 or cache_file is not None:
+        FITNESS_CACHE = FitnessCache(cache_size or 100000, cache_file)
+
+    # Rulează pentru numărul maxim de generații
+    aborted = True  # devine False doar dacă antrenarea se termină normal
+    try:
+        winner = p.run(eval_genomes, generations)  # execută evaluarea genomurilor
+        aborted = False
+    finally:
+        if EVALUATOR is not None:  # oprește procesele (imediat după o întrerupere sau o eroare)
+            EVALUATOR.close(abort=aborted)
+            EVALUATOR = None
+        if FITNESS_CACHE is not None:  # închide fișierul cache-ului
+            FITNESS_CACHE.close()
+            FITNESS_CACHE = None
+        if profiler is not None:  # salvează timpii pe faze
+            profiler.save_csv(profile_file)
+            PROFILER = None
+        if checkpointer is not None:  # așteaptă scrierea ultimului checkpoint
+            checkpointer.wait()
+        if reporter is not None:  # scrie înregistrările rămase
+            reporter.close()
 
     # Arată statisticile finale
     print('\nBest genome:\n{!s}'.format(winner))  # afișează cel mai bun genom
 
+    if winner_file is not None and winner is not None:  # salvează câștigătorul într-un format care poate fi încărcat
+        checkpoint.save_winner(winner_file, winner, config)
+
+    return winner, stats
+
 
 if __name__ == '__main__':
     # Determină calea către fișierul de configurare. Această manipulare a căii
@@ -456,4 +1167,41 @@ if __name__ == '__main__':
     # directorul de lucru curent.
     local_dir = os.path.dirname(__file__)  # obține directorul curent
     config_path = os.path.join(local_dir, 'config-feedforward.txt')  # construiește calea către fișierul de configurare
-    run(config_path)  # execută jocul
\ No newline at end of file
+
+    # Opțiunile din linia de comandă
+    parser = argparse.ArgumentParser(description="Antrenează NEAT să joace Flappy Bird")
+    parser.add_argument("--headless", action="store_true", help="rulează fără fereastră, cât de repede permite procesorul")
+    parser.add_argument("--render-every", type=int, default=0, metavar="N", help="în modul headless, desenează fiecare a N-a generație")
+    parser.add_argument("--seed", type=int, default=None, help="sămânța pentru generatorul aleator")
+    parser.add_argument("--generations", type=int, default=50, help="numărul maxim de generații")
+    parser.add_argument("--workers", type=int, default=1, help="numărul de procese pentru evaluarea genomurilor")
+    parser.add_argument("--course-seed", type=int, default=None, help="joacă toate generațiile pe aceleași trasee fixe")
+    parser.add_argument("--courses", type=int, default=1, metavar="K", help="evaluează fiecare genom pe K trasee")
+    parser.add_argument("--cache-size", type=int, default=0, help="numărul de genomuri din cache-ul de fitness (0 = fără cache)")
+    parser.add_argument("--cache-file", default=None, help="fișier SQLite în care cache-ul de fitness este păstrat pe disc")
+    parser.add_argument("--profile", default=None, metavar="CSV", help="măsoară timpul fiecărei faze și îl salvează în fișierul CSV")
+    parser.add_argument("--checkpoint-dir", default=None, help="directorul pentru checkpoint-uri")
+    parser.add_argument("--checkpoint-every", type=int, default=5, metavar="N", help="salvează un checkpoint la fiecare N generații")
+    parser.add_argument("--checkpoint-minutes", type=float, default=None, help="salvează un checkpoint după cel mult atâtea minute")
+    parser.add_argument("--resume", action="store_true", help="continuă din cel mai recent checkpoint din --checkpoint-dir")
+    parser.add_argument("--winner", default=None, metavar="FILE", help="salvează cel mai bun genom și rețeaua lui")
+    parser.add_argument("--replay-dir", default=None, help="înregistrează fiecare generație pentru playback.py")
+    parser.add_argument("--draw-top", type=int, default=None, metavar="N", help="desenează cel mult N păsări în viață")
+    parser.add_argument("--max-frames", type=int, default=None, help="numărul maxim de frame-uri pe traseu într-o generație")
+    parser.add_argument("--max-score", type=int, default=None, help="oprește generația când scorul ajunge la această valoare")
+    parser.add_argument("--time-budget", type=float, default=None, metavar="SECONDS", help="timpul maxim al unei generații")
+    parser.add_argument("--telemetry", default=None, metavar="TARGET", help="trimite statisticile generațiilor ca NDJSON: fișier, tcp://host:port sau unix:///cale")
+    parser.add_argument("--early-cutoff", type=int, default=None, metavar="N", help="oprește generația când rămân în viață cel mult N păsări")
+    args = parser.parse_args()
+    if args.early_cutoff is not None and (args.workers > 1 or args.courses > 1):
+        parser.error("--early-cutoff nu poate fi folosit cu --workers sau --courses mai mari decât 1")
+
+    run(config_path, headless=args.headless, render_every=args.render_every,
+        seed=args.seed, generations=args.generations, workers=args.workers,
+        course_seed=args.course_seed, courses=args.courses,
+        cache_size=args.cache_size, cache_file=args.cache_file,
+        profile_file=args.profile, checkpoint_dir=args.checkpoint_dir,
+        checkpoint_every=args.checkpoint_every, checkpoint_minutes=args.checkpoint_minutes,
+        resume=args.resume, winner_file=args.winner, replay_dir=args.replay_dir,
+        draw_top=args.draw_top, max_frames=args.max_frames, max_score=args.max_score,
+        time_budget=args.time_budget, early_cutoff=args.early_cutoff, telemetry=args.telemetry)  # execută jocul
\ No newline at end of file
@@ -0,0 +1,108 @@
+import time
+
+import numpy as np
+
+EXTINCT = "extinct"  # toate păsările au murit (oprirea normală)
+MAX_FRAMES = "max_frames"
+MAX_SCORE = "max_score"
+TIME_BUDGET = "time_budget"
+CUTOFF = "cutoff"
+
+
+class GenerationLimits:
+    """
+    Limitele unei generații: numărul de frame-uri, scorul, timpul real și
+    oprirea timpurie când clasamentul nu se mai poate schimba. Toate păsările
+    în viață au același fitness (aceleași frame-uri și aceleași țevi), deci la
+    oprire ele rămân la egalitate, deasupra tuturor celor moarte
+    """
+
+    def __init__(self, max_frames=None, max_score=None, time_budget=None, cutoff=None, margin=1.0):
+        """
+        :param max_frames: numărul maxim de frame-uri pe traseu (int sau None)
+        :param max_score: scorul (țevile trecute) la care se oprește jocul (int sau None)
+        :param time_budget: timpul maxim al generației, în secunde (float sau None)
+        :param cutoff: oprește jocul când rămân în viață cel mult atâtea păsări (int sau None),
+            dar doar după ce ele au ajuns cu mai mult de margin înaintea tuturor păsărilor moarte.
+            Păsările rămase sunt atunci înaintea celorlalte și fără oprire, iar cu 1 clasamentul
+            final este exact același; doar când o singură simulare vede toată populația pe un
+            singur traseu (fără procese și fără mai multe trasee)
+        :param margin: cât fitness mai poate pierde o pasăre în viață (penalizarea pentru o coliziune)
+        :return: None
+        """
+        self.max_frames = max_frames
+        self.max_score = max_score
+        self.time_budget = time_budget
+        self.cutoff = cutoff
+        self.margin = margin
+        self.deadline = None  # momentul (time.time, același în toate procesele) la care expiră timpul
+        self.reason = None  # de ce s-a oprit ultima simulare
+        self.frames = 0  # după câte frame-uri s-a oprit ultima simulare
+
+    def start(self):
+        """
+        Pornește cronometrul generației
+        :return: None
+        """
+        if self.time_budget is not None:
+            self.deadline = time.time() + self.time_budget
+
+    def expired(self):
+        """
+        :return: True dacă timpul generației s-a terminat
+        """
+        return self.deadline is not None and time.time() >= self.deadline
+
+    def check(self, frames, score, alive, lead=float("inf")):
+        """
+        Verifică limitele la sfârșitul unui frame
+        :param frames: frame-urile jucate (int)
+        :param score: scorul (int)
+        :param alive: numărul de păsări în viață (int)
+        :param lead: cu cât este fitness-ul păsărilor în viață peste cel mai bun fitness al
+            păsărilor moarte (float, vezi survivor_lead)
+        :return: motivul opririi (str) sau None dacă jocul continuă
+        """
+        if alive == 0:
+            return EXTINCT
+        if self.max_frames is not None and frames >= self.max_frames:
+            return MAX_FRAMES
+        if self.max_score is not None and score >= self.max_score:
+            return MAX_SCORE
+        if self.cutoff is not None and alive <= self.cutoff and lead > self.margin:
+            return CUTOFF
+        if self.expired():
+            return TIME_BUDGET
+        return None
+
+
+def survivor_lead(fitness, alive):
+    """
+    Avansul păsărilor în viață (toate au același fitness) față de cea mai bună pasăre moartă.
+    O pasăre care moare chiar în frame-ul curent, ieșind din ecran, are același fitness ca
+    cele rămase, deci avansul este 0 până când acestea trec de ea
+    :param fitness: tablou cu fitness-ul tuturor păsărilor
+    :param alive: tablou bool cu păsările în viață (cel puțin una)
+    :return: diferența de fitness (float, infinit dacă nu a murit nicio pasăre)
+    """
+    dead = fitness[~alive]
+    if len(dead) == 0:
+        return float("inf")
+    return float(fitness[alive][0] - dead.max())
+
+
+def cap_fitness(fitness, stops):
+    """
+    Aduce la aceeași limită fitness-ul grupurilor de păsări simulate separat
+    (de exemplu în procese diferite) care s-au oprit la frame-uri diferite.
+    Păsările rămase în viață într-un grup au fitness-ul maxim al grupului, deci
+    limita comună este cel mai mic dintre aceste maxime
+    :param fitness: tablou cu fitness-ul tuturor păsărilor
+    :param stops: lista (motiv, frame-uri, fitness-ul maxim al grupului) pentru fiecare grup
+    :return: (fitness-ul limitat, motivul opririi, frame-urile), pentru grupul oprit cel mai devreme
+    """
+    stopped = [stop for stop in stops if stop[0] != EXTINCT]
+    if not stopped:  # toate păsările au murit, nu e nimic de limitat
+        return fitness, EXTINCT, max(stop[1] for stop in stops)
+    reason, frames, top = min(stopped, key=lambda stop: stop[2])
+    return np.minimum(fitness, top), reason, frames
@@ -0,0 +1,125 @@
+import multiprocessing
+import signal
+
+import numpy as np
+
+from profiling import PhaseTimer
+from replay import ReplayRecorder
+
+# Starea fiecărui proces de lucru, setată o singură dată la pornirea lui
+_simulate = None  # funcția care simulează un grup de genomuri
+_config = None  # configurația NEAT
+_take_counters = None  # funcția care returnează și golește contoarele simulării
+_timer = None  # profiling.PhaseTimer al procesului (None = fără măsurare)
+
+
+def _init_worker(simulate, config, take_counters=None, profile=False):
+    """
+    Pregătește un proces de lucru (rulează o singură dată, la pornirea lui)
+    :param simulate: funcția simulate(genomes, config, track, recorder=None, limits=None, profiler=None)
+    :param config: configurația NEAT
+    :param take_counters: funcția care returnează și golește contoarele simulării (sau None)
+    :param profile: măsoară timpul fazelor buclei de joc (bool)
+    :return: None
+    """
+    global _simulate, _config, _take_counters, _timer
+    # Ctrl-C ajunge la tot grupul de procese; doar procesul principal îl tratează (vezi close)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _simulate = simulate
+    _config = config
+    _take_counters = take_counters
+    _timer = PhaseTimer() if profile else None
+
+
+def _evaluate_chunk(genomes, track, record=False, limits=None):
+    """
+    Simulează headless un grup de genomuri într-un proces de lucru
+    :param genomes: lista de genomuri
+    :param track: traseul (course.Course) sau lista de trasee jucate deodată, aceleași pentru toate procesele
+    :param record: înregistrează jocul grupului, doar pentru un singur traseu (bool)
+    :param limits: limitele generației (limits.GenerationLimits sau None)
+    :return: (tabloul cu fitness-ul fiecărui genom, vezi simulate, Replay sau None,
+        (motivul opririi, frame-uri, fitness-ul maxim) sau None fără limite, contoarele grupului sau None,
+        (timpi, apeluri) pe faze sau None fără măsurare)
+    """
+    recorder = ReplayRecorder(len(genomes), track.seed) if record else None
+    fitness = _simulate(genomes, _config, track, recorder=recorder, limits=limits, profiler=_timer)
+    replay = recorder.replay(fitness) if recorder is not None else None
+    stop = (limits.reason, limits.frames, fitness.max()) if limits is not None else None
+    counters = _take_counters() if _take_counters is not None else None
+    phases = None
+    if _timer is not None:  # timpii acestui grup, trimiși procesului principal
+        phases = (dict(_timer.times), dict(_timer.calls))
+        _timer.reset()
+    return fitness, replay, stop, counters, phases
+
+
+class ParallelEvaluator:
+    """
+    Împarte genomurile unei generații între mai multe procese. Procesele sunt
+    pornite o singură dată și rămân active pe toată durata antrenării
+    """
+
+    def __init__(self, num_workers, simulate, config, take_counters=None, profile=False):
+        """
+        Pornește procesele de lucru
+        :param num_workers: numărul de procese (int)
+        :param simulate: funcția simulate(genomes, config, track, recorder=None, limits=None, profiler=None),
+            definită la nivel de modul
+        :param config: configurația NEAT (trimisă o singură dată fiecărui proces)
+        :param take_counters: funcția, definită la nivel de modul, care returnează și golește contoarele
+            simulării dintr-un proces (sau None)
+        :param profile: fiecare proces măsoară timpul fazelor buclei de joc și îl trimite înapoi (bool)
+        :return: None
+        """
+        self.num_workers = num_workers
+        self.pool = multiprocessing.Pool(num_workers, initializer=_init_worker,
+                                         initargs=(simulate, config, take_counters, profile))
+
+    def evaluate(self, genomes, track, record=False, limits=None):
+        """
+        Evaluează genomurile în paralel pe aceleași trasee
+        :param genomes: lista de genomuri
+        :param track: traseul (course.Course) sau lista de trasee jucate deodată (fiecare traseu
+            este trimis ca tablou compact de înălțimi)
+        :param record: fiecare proces înregistrează jocul grupului lui, doar pentru un singur traseu (bool)
+        :param limits: limitele generației, aceleași pentru toate procesele (limits.GenerationLimits sau None)
+        :return: (tabloul cu fitness-ul fiecărui genom în aceeași ordine, de forma (trasee, genomuri)
+            pentru o listă de trasee, lista înregistrărilor grupurilor,
+            lista opririlor grupurilor (vezi limits.cap_fitness), lista contoarelor grupurilor,
+            lista timpilor pe faze ai grupurilor)
+        """
+        chunks = [list(c) for c in np.array_split(np.arange(len(genomes)), self.num_workers) if len(c)]
+        jobs = [self.pool.apply_async(_evaluate_chunk, ([genomes[i] for i in chunk], track, record, limits))
+                for chunk in chunks]
+
+        fitness = []
+        replays = []
+        stops = []
+        counters = []
+        phases = []
+        for job in jobs:  # rezultatele sunt citite în ordinea grupurilor
+            values, replay, stop, chunk_counters, chunk_phases = job.get()
+            fitness.append(values)
+            if replay is not None:
+                replays.append(replay)
+            if stop is not None:
+                stops.append(stop)
+            if chunk_counters is not None:
+                counters.append(chunk_counters)
+            if chunk_phases is not None:
+                phases.append(chunk_phases)
+        return np.concatenate(fitness, axis=-1), replays, stops, counters, phases
+
+    def close(self, abort=False):
+        """
+        Oprește procesele de lucru
+        :param abort: oprește procesele imediat, fără să aștepte grupurile începute (bool),
+            de exemplu după o întrerupere, când rezultatele lor nu mai sunt citite
+        :return: None
+        """
+        if abort:
+            self.pool.terminate()
+        else:
+            self.pool.close()
+        self.pool.join()
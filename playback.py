@@ -0,0 +1,197 @@
+import argparse
+import os
+
+import neat
+import numpy as np
+import pygame
+
+import checkpoint
+import course
+import flappy_bird
+from flappy_bird import BirdPopulation, Pipe, Base, FLOOR, WIN_WIDTH
+from replay import Replay, ReplayRecorder
+
+SEEK_FRAMES = 150  # câte frame-uri sare o apăsare pe săgeată (5 secunde de joc)
+
+
+class Player:
+    """
+    Reconstruiește un joc înregistrat frame cu frame: țevile vin din sămânța
+    traseului, săriturile și morțile din înregistrare, iar fizica păsărilor
+    este aceeași ca în simulare. Nu are nevoie de rețele neuronale
+    """
+
+    def __init__(self, replay, top=None):
+        """
+        :param replay: înregistrarea (Replay)
+        :param top: arată doar cele mai bune top păsări după fitness (int sau None = toate)
+        :return: None
+        """
+        self.replay = replay
+        self.track = course.Course(replay.course_seed)
+        self.visible = np.ones(replay.size, dtype=bool)  # păsările afișate
+        if top is not None and replay.fitness is not None:
+            self.visible[:] = False
+            self.visible[np.argsort(-replay.fitness)[:top]] = True
+        self.reset()
+
+    def reset(self):
+        """
+        Revine la începutul jocului
+        :return: None
+        """
+        self.frame = 0  # următorul frame de jucat
+        self.birds = BirdPopulation(self.replay.size, 230, 350)
+        self.birds.alive &= self.visible
+        self.base = Base(FLOOR)
+        self.pipes = [Pipe(700, self.track.height(0))]
+        self.pipe_count = 1
+        self.score = 0
+        self.pipe_ind = 0
+
+    @property
+    def finished(self):
+        """
+        :return: True dacă toate frame-urile înregistrate au fost jucate
+        """
+        return self.frame >= self.replay.frames
+
+    def step(self):
+        """
+        Joacă un frame, în aceeași ordine ca bucla din flappy_bird.simulate
+        :return: None
+        """
+        birds, pipes = self.birds, self.pipes
+        self.pipe_ind = 0
+        if len(pipes) > 1 and birds.x > pipes[0].x + pipes[0].PIPE_TOP.get_width():
+            self.pipe_ind = 1
+
+        birds.move()
+        birds.jump(birds.alive & self.replay.jump(self.frame))
+        self.base.move()
+
+        rem = []
+        add_pipe = False
+        for pipe in pipes:
+            pipe.move()
+            if pipe.x + pipe.PIPE_TOP.get_width() < 0:
+                rem.append(pipe)
+            if not pipe.passed and pipe.x < birds.x:
+                pipe.passed = True
+                add_pipe = True
+        birds.kill(self.replay.deaths == self.frame)  # coliziunile și ieșirile din ecran, din înregistrare
+
+        if add_pipe:
+            self.score += 1
+            pipes.append(Pipe(WIN_WIDTH, self.track.height(self.pipe_count)))
+            self.pipe_count += 1
+        for r in rem:
+            pipes.remove(r)
+
+        birds.animate()
+        self.frame += 1
+
+    def seek(self, frame):
+        """
+        Sare la un frame, fără să deseneze frame-urile intermediare
+        :param frame: frame-ul dorit (int)
+        :return: None
+        """
+        frame = max(0, min(frame, self.replay.frames))
+        if frame < self.frame:  # înapoi: jocul se reconstruiește de la început
+            self.reset()
+        while self.frame < frame:
+            self.step()
+
+    def draw(self, win):
+        """
+        Desenează frame-ul curent
+        :param win: fereastra pygame
+        :return: None
+        """
+        flappy_bird.draw_window(win, self.birds, self.pipes, self.base, self.score,
+                                self.replay.generation, self.pipe_ind)
+
+
+def record_winner(winner_file, config_file, course_seed, max_frames):
+    """
+    Joacă headless genomul câștigător pe un traseu și îl înregistrează
+    :param winner_file: fișierul salvat cu --winner (str)
+    :param config_file: fișierul de configurare NEAT
+    :param course_seed: sămânța traseului (int)
+    :param max_frames: limita de frame-uri, un câștigător bun poate zbura la nesfârșit (int)
+    :return: Replay
+    """
+    genome, net = checkpoint.load_winner(winner_file)
+    config = neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                config_file)
+    recorder = ReplayRecorder(1, course_seed)
+    fitness = flappy_bird.simulate([genome], config, course.Course(course_seed), max_frames=max_frames,
+                                   recorder=recorder)
+    return recorder.replay(fitness)
+
+
+def play(player, speed=1.0, skip=1, start=0):
+    """
+    Redă înregistrarea în fereastră până la final sau până la închiderea ferestrei.
+    Taste: spațiu = pauză, săgeți stânga/dreapta = înapoi/înainte, sus/jos = viteză
+    :param player: Player
+    :param speed: viteza față de jocul original de 30 FPS (float)
+    :param skip: desenează doar fiecare al N-lea frame (int)
+    :param start: frame-ul de la care începe redarea (int)
+    :return: None
+    """
+    win = flappy_bird.get_window()
+    clock = pygame.time.Clock()
+    player.seek(start)
+    paused = False
+
+    while not player.finished:
+        clock.tick(30 * speed / skip)  # skip frame-uri jucate la fiecare desenare
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                return
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key == pygame.K_RIGHT:
+                    player.seek(player.frame + SEEK_FRAMES)
+                elif event.key == pygame.K_LEFT:
+                    player.seek(player.frame - SEEK_FRAMES)
+                elif event.key == pygame.K_UP:
+                    speed *= 2
+                elif event.key == pygame.K_DOWN:
+                    speed /= 2
+
+        if not paused:
+            for _ in range(skip):
+                if player.finished:
+                    break
+                player.step()
+        player.draw(win)
+
+
+if __name__ == '__main__':
+    local_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Redă o generație înregistrată sau genomul câștigător")
+    parser.add_argument("replay", nargs="?", default=None, help="fișierul unei generații din --replay-dir")
+    parser.add_argument("--winner", default=None, metavar="FILE", help="joacă genomul salvat cu --winner")
+    parser.add_argument("--course-seed", type=int, default=0, help="traseul pe care joacă genomul câștigător")
+    parser.add_argument("--max-frames", type=int, default=10000, help="limita de frame-uri pentru genomul câștigător")
+    parser.add_argument("--config", default=os.path.join(local_dir, "config-feedforward.txt"), help="fișierul de configurare NEAT")
+    parser.add_argument("--speed", type=float, default=1.0, help="viteza redării (2 = de două ori mai repede)")
+    parser.add_argument("--skip", type=int, default=1, metavar="N", help="desenează doar fiecare al N-lea frame")
+    parser.add_argument("--start", type=int, default=0, metavar="FRAME", help="începe redarea de la acest frame")
+    parser.add_argument("--top", type=int, default=None, metavar="N", help="arată doar cele mai bune N păsări")
+    args = parser.parse_args()
+
+    if args.winner is not None:
+        replay = record_winner(args.winner, args.config, args.course_seed, args.max_frames)
+    elif args.replay is not None:
+        replay = Replay.load(args.replay)
+    else:
+        parser.error("este nevoie de un fișier de înregistrare sau de --winner")
+
+    play(Player(replay, args.top), speed=args.speed, skip=max(args.skip, 1), start=args.start)
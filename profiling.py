@@ -0,0 +1,107 @@
+import collections
+import csv
+import time
+
+from neat.reporting import BaseReporter
+
+
+class PhaseTimer:
+    """
+    Acumulează timpul și numărul de apeluri pentru fiecare fază a buclei de joc.
+    Se folosește ca un cronometru cu ture: record() adaugă timpul scurs de la
+    tura anterioară la faza dată și pornește tura următoare
+    """
+
+    def __init__(self):
+        """
+        Creează un cronometru gol
+        :return: None
+        """
+        self.times = collections.defaultdict(float)  # faza -> timpul total în secunde
+        self.calls = collections.Counter()  # faza -> numărul de apeluri
+
+    def start(self):
+        """
+        Pornește o tură nouă
+        :return: momentul de început (float)
+        """
+        return time.perf_counter()
+
+    def record(self, phase, start):
+        """
+        Adaugă timpul scurs de la start la faza dată
+        :param phase: numele fazei (str)
+        :param start: momentul de început al turei (float)
+        :return: momentul de început al turei următoare (float)
+        """
+        now = time.perf_counter()
+        self.times[phase] += now - start
+        self.calls[phase] += 1
+        return now
+
+    def merge(self, times, calls):
+        """
+        Adaugă măsurătorile altui cronometru (de exemplu dintr-un proces de lucru)
+        :param times: faza -> timpul în secunde (dict)
+        :param calls: faza -> numărul de apeluri (dict)
+        :return: None
+        """
+        for phase, seconds in times.items():
+            self.times[phase] += seconds
+        self.calls.update(calls)
+
+    def reset(self):
+        """
+        Șterge toate măsurătorile
+        :return: None
+        """
+        self.times.clear()
+        self.calls.clear()
+
+
+class ProfilingReporter(BaseReporter):
+    """
+    Reporter NEAT care păstrează, pentru fiecare generație, timpul și numărul
+    de apeluri ale fiecărei faze (fizică, inferență, coliziuni, eliminare,
+    desenare). Cu mai multe procese, timpii lor sunt adunați (vezi
+    PhaseTimer.merge), deci sunt timp de procesor, nu timp real
+    """
+
+    def __init__(self, show=True):
+        """
+        Creează reporterul
+        :param show: afișează un rezumat la fiecare generație (bool)
+        :return: None
+        """
+        self.show = show
+        self.timer = PhaseTimer()  # cronometrul folosit de bucla de joc
+        self.history = []  # lista (generație, durata generației, timpi, apeluri)
+        self.generation = None
+        self.generation_start = None
+
+    def start_generation(self, generation):
+        self.generation = generation
+        self.generation_start = time.perf_counter()
+        self.timer.reset()
+
+    def post_evaluate(self, config, population, species, best_genome):
+        elapsed = time.perf_counter() - self.generation_start
+        self.history.append((self.generation, elapsed, dict(self.timer.times), dict(self.timer.calls)))
+        if self.show:
+            phases = ", ".join("{} {:.3f}s".format(phase, t) for phase, t in
+                               sorted(self.timer.times.items(), key=lambda item: -item[1]))
+            print("Timp pe faze ({:.3f}s în total): {}".format(elapsed, phases))
+
+    def save_csv(self, path):
+        """
+        Scrie măsurătorile în format CSV (un rând pentru fiecare generație și fază)
+        :param path: fișierul CSV
+        :return: None
+        """
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["generation", "phase", "seconds", "calls"])
+            for generation, elapsed, times, calls in self.history:
+                for phase in sorted(times):
+                    writer.writerow([generation, phase, "{:.6f}".format(times[phase]), calls[phase]])
+                writer.writerow([generation, "generation", "{:.6f}".format(elapsed), 1])
@@ -0,0 +1,130 @@
+import numpy as np
+
+
+class Replay:
+    """
+    Înregistrarea compactă a unui joc: sămânța traseului, deciziile de săritură
+    ale fiecărei păsări în fiecare frame (câte un bit) și frame-ul în care a
+    murit fiecare pasăre. Fizica este deterministă, deci jocul poate fi
+    reconstruit exact fără rețele neuronale și fără coliziuni
+    """
+
+    def __init__(self, course_seed, jumps, deaths, size, fitness=None, generation=0):
+        """
+        :param course_seed: sămânța traseului (int)
+        :param jumps: tablou uint8 (frame-uri, octeți), biții săriturilor împachetați cu np.packbits
+        :param deaths: frame-ul în care a murit fiecare pasăre (-1 = în viață la final)
+        :param size: numărul de păsări (int)
+        :param fitness: fitness-ul fiecărei păsări (tablou sau None)
+        :param generation: generația înregistrată (int)
+        :return: None
+        """
+        self.course_seed = course_seed
+        self.jumps = jumps
+        self.deaths = deaths
+        self.size = size
+        self.fitness = fitness
+        self.generation = generation
+
+    @property
+    def frames(self):
+        """
+        :return: numărul de frame-uri înregistrate
+        """
+        return len(self.jumps)
+
+    def jump(self, frame):
+        """
+        :param frame: indexul frame-ului (int)
+        :return: tablou bool cu păsările care sar în acel frame
+        """
+        return np.unpackbits(self.jumps[frame], count=self.size).astype(bool)
+
+    def save(self, path):
+        """
+        Salvează înregistrarea într-un fișier .npz comprimat
+        :param path: fișierul (str)
+        :return: None
+        """
+        fitness = self.fitness if self.fitness is not None else np.zeros(0)
+        with open(path, "wb") as f:  # cu un obiect fișier, NumPy nu adaugă extensia .npz
+            np.savez_compressed(f, course_seed=self.course_seed, jumps=self.jumps, deaths=self.deaths,
+                                size=self.size, fitness=fitness, generation=self.generation)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Încarcă o înregistrare salvată cu save()
+        :param path: fișierul (str)
+        :return: Replay
+        """
+        with np.load(path) as data:
+            fitness = data["fitness"] if len(data["fitness"]) else None
+            return cls(int(data["course_seed"]), data["jumps"], data["deaths"], int(data["size"]),
+                       fitness, int(data["generation"]))
+
+    @classmethod
+    def concat(cls, replays):
+        """
+        Unește înregistrările aceluiași traseu făcute pe grupuri diferite de păsări
+        (de exemplu în procese diferite), în ordinea grupurilor
+        :param replays: lista de înregistrări
+        :return: Replay
+        """
+        frames = max(r.frames for r in replays)
+        jumps = np.zeros((frames, sum(r.size for r in replays)), dtype=bool)
+        col = 0
+        for r in replays:  # frame-urile de după sfârșitul unui grup rămân fără sărituri
+            jumps[:r.frames, col:col + r.size] = np.unpackbits(r.jumps, axis=1, count=r.size).astype(bool)
+            col += r.size
+        fitness = None
+        if all(r.fitness is not None for r in replays):
+            fitness = np.concatenate([r.fitness for r in replays])
+        return cls(replays[0].course_seed, np.packbits(jumps, axis=1), np.concatenate([r.deaths for r in replays]),
+                   jumps.shape[1], fitness, replays[0].generation)
+
+
+class ReplayRecorder:
+    """
+    Înregistrează un joc în timpul simulării. Costul pe frame este o singură
+    împachetare de biți
+    """
+
+    def __init__(self, size, course_seed, generation=0):
+        """
+        :param size: numărul de păsări (int)
+        :param course_seed: sămânța traseului (int)
+        :param generation: generația înregistrată (int)
+        :return: None
+        """
+        self.size = size
+        self.course_seed = course_seed
+        self.generation = generation
+        self.jumps = []  # biții săriturilor pentru fiecare frame
+        self.deaths = np.full(size, -1, dtype=np.int32)  # frame-ul morții fiecărei păsări
+
+    def record_frame(self, jump):
+        """
+        Înregistrează săriturile unui frame
+        :param jump: tablou bool cu păsările care sar
+        :return: None
+        """
+        self.jumps.append(np.packbits(jump))
+
+    def record_deaths(self, mask, frame):
+        """
+        Înregistrează păsările care au murit în frame-ul dat
+        :param mask: tablou bool cu păsările eliminate
+        :param frame: indexul frame-ului (int)
+        :return: None
+        """
+        self.deaths[mask & (self.deaths < 0)] = frame
+
+    def replay(self, fitness=None):
+        """
+        :param fitness: fitness-ul final al păsărilor (tablou sau None)
+        :return: Replay cu tot ce s-a înregistrat
+        """
+        nbytes = (self.size + 7) // 8
+        jumps = np.array(self.jumps, dtype=np.uint8).reshape(len(self.jumps), nbytes)
+        return Replay(self.course_seed, jumps, self.deaths.copy(), self.size, fitness, self.generation)
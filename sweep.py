@@ -0,0 +1,305 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # antrenările rulează fără afișaj
+
+import argparse
+import configparser
+import contextlib
+import csv
+import hashlib
+import io
+import itertools
+import json
+import multiprocessing
+import random
+import time
+
+import flappy_bird
+
+RESULTS = "results.csv"  # tabelul cu rezultatele, în directorul sweep-ului
+FIELDS = ["run_id", "seed", "generations", "generations_to_threshold", "best_fitness", "wall_time"]
+
+
+def parse_option(text):
+    """
+    Desparte o opțiune de forma "cheie=valori"
+    :param text: de exemplu "pop_size=20,50,100" sau "conn_add_prob=0.1:0.9"
+    :return: (cheia, valorile ca text)
+    """
+    key, sep, values = text.partition("=")
+    if not sep or not key or not values:
+        raise argparse.ArgumentTypeError("opțiunea trebuie scrisă ca cheie=valori: {}".format(text))
+    return key.strip(), values.strip()
+
+
+def find_key(parser, key):
+    """
+    Găsește secțiunea unei chei din configurație
+    :param parser: configurația de bază (configparser.ConfigParser)
+    :param key: "cheie" sau "Secțiune.cheie" când cheia apare în mai multe secțiuni
+    :return: (secțiunea, cheia)
+    """
+    if "." in key:
+        section, key = key.split(".", 1)
+        if not parser.has_option(section, key):
+            raise ValueError("Configurația nu are cheia {}.{}".format(section, key))
+        return section, key
+    sections = [section for section in parser.sections() if parser.has_option(section, key)]
+    if len(sections) != 1:
+        raise ValueError("Cheia {} apare în {} secțiuni; scrie-o ca Secțiune.cheie".format(key, len(sections)))
+    return sections[0], key
+
+
+def grid_points(grid):
+    """
+    Toate combinațiile valorilor din grilă
+    :param grid: lista (cheie, "v1,v2,...")
+    :return: lista de dicționare cheie -> valoare (text)
+    """
+    keys = [key for key, values in grid]
+    choices = [values.split(",") for key, values in grid]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*choices)]
+
+
+def random_points(ranges, samples, seed):
+    """
+    Puncte alese aleator: "min:max" este un interval (întreg dacă ambele capete
+    sunt întregi), iar "v1,v2,..." o listă din care se alege o valoare
+    :param ranges: lista (cheie, "min:max" sau "v1,v2,...")
+    :param samples: numărul de puncte (int)
+    :param seed: sămânța alegerilor, ca sweep-ul reluat să aleagă aceleași puncte (int)
+    :return: lista de dicționare cheie -> valoare (text)
+    """
+    rng = random.Random(seed)
+    points = []
+    for _ in range(samples):
+        point = {}
+        for key, values in ranges:
+            if ":" in values:
+                low, high = values.split(":")
+                if low.lstrip("-").isdigit() and high.lstrip("-").isdigit():
+                    point[key] = str(rng.randint(int(low), int(high)))
+                else:
+                    point[key] = "{:.4g}".format(rng.uniform(float(low), float(high)))
+            else:
+                point[key] = rng.choice(values.split(","))
+        points.append(point)
+    return points
+
+
+def variants(grid, ranges, samples, seed):
+    """
+    Combină fiecare punct din grilă cu fiecare punct aleator
+    :param grid: lista (cheie, "v1,v2,...") pentru grilă
+    :param ranges: lista (cheie, "min:max" sau "v1,v2,...") pentru căutarea aleatoare
+    :param samples: numărul de puncte aleatoare (int)
+    :param seed: sămânța alegerilor aleatoare (int)
+    :return: lista de dicționare cheie -> valoare (text), fără dubluri
+    """
+    points = [dict(g, **r) for g in grid_points(grid) for r in (random_points(ranges, samples, seed) or [{}])]
+    unique = []
+    for point in points:
+        if point not in unique:
+            unique.append(point)
+    return unique
+
+
+def run_id(config_text, seed, settings):
+    """
+    Identificatorul unei antrenări: depinde de întreaga configurație a variantei
+    (deci și de configurația de bază), de sămânță și de setările antrenării, deci
+    aceeași antrenare are mereu același identificator
+    :param config_text: configurația variantei (str, vezi render_config)
+    :param seed: sămânța antrenării (int)
+    :param settings: generațiile și argumentele pentru flappy_bird.run (dict)
+    :return: str
+    """
+    text = json.dumps({"config": config_text, "seed": seed, "settings": settings}, sort_keys=True)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+def render_config(base_file, params):
+    """
+    Construiește o variantă a configurației de bază
+    :param base_file: configurația de bază
+    :param params: dicționar cheie -> valoare (text), vezi find_key
+    :return: (textul variantei, pragul de fitness al variantei)
+    """
+    parser = configparser.ConfigParser()
+    with open(base_file) as f:
+        parser.read_file(f)
+    for key, value in params.items():
+        section, option = find_key(parser, key)
+        parser.set(section, option, value)
+    text = io.StringIO()
+    parser.write(text)
+    return text.getvalue(), parser.getfloat("NEAT", "fitness_threshold")
+
+
+def train(job):
+    """
+    Rulează o antrenare headless într-un proces al pool-ului. Ieșirea NEAT merge
+    în train.log, în directorul antrenării
+    :param job: dicționarul antrenării (vezi plan)
+    :return: rândul din tabelul de rezultate (dict)
+    """
+    log_file = os.path.join(job["run_dir"], "train.log")
+    with open(log_file, "w") as log, contextlib.redirect_stdout(log):
+        start = time.perf_counter()
+        winner, stats = flappy_bird.run(job["config"], headless=True, seed=job["seed"],
+                                        generations=job["generations"], **job["options"])
+        wall = time.perf_counter() - start
+
+    best = [genome.fitness for genome in stats.most_fit_genomes]  # cel mai bun fitness din fiecare generație
+    reached = [i + 1 for i, value in enumerate(best) if value >= job["threshold"]]
+    row = {
+        "run_id": job["run_id"],
+        "seed": job["seed"],
+        "generations": len(best),
+        "generations_to_threshold": reached[0] if reached else "",
+        "best_fitness": max(best, default=float("nan")),
+        "wall_time": round(wall, 3),
+    }
+    row.update(job["params"])
+    return row
+
+
+def plan(base_file, points, seeds, generations, options, directory):
+    """
+    Pregătește antrenările: câte una pentru fiecare variantă și fiecare sămânță
+    :param base_file: configurația de bază
+    :param points: variantele (vezi variants)
+    :param seeds: sămânțele (listă de int)
+    :param generations: numărul maxim de generații al fiecărei antrenări (int)
+    :param options: argumente suplimentare pentru flappy_bird.run (dict)
+    :param directory: directorul sweep-ului
+    :return: lista de antrenări (dict)
+    """
+    jobs = []
+    for params in points:
+        config_text, threshold = render_config(base_file, params)
+        for seed in seeds:
+            rid = run_id(config_text, seed, dict(options, generations=generations))
+            run_dir = os.path.join(directory, "runs", rid)
+            os.makedirs(run_dir, exist_ok=True)
+            config = os.path.join(run_dir, "config.txt")
+            if not os.path.exists(config):  # același identificator înseamnă aceeași configurație
+                with open(config, "w") as f:
+                    f.write(config_text)
+            jobs.append({"run_id": rid, "params": params, "seed": seed, "config": config,
+                         "threshold": threshold, "generations": generations,
+                         "options": options, "run_dir": run_dir})
+    return jobs
+
+
+def finished_runs(results_file):
+    """
+    :param results_file: tabelul cu rezultate (CSV)
+    :return: identificatorii antrenărilor terminate (set)
+    """
+    if not os.path.exists(results_file):
+        return set()
+    with open(results_file, newline="") as f:
+        return {row["run_id"] for row in csv.DictReader(f)}
+
+
+def sweep(jobs, results_file, workers):
+    """
+    Rulează antrenările încă neterminate pe un pool de procese și adaugă fiecare
+    rezultat în tabel imediat ce este gata. Un sweep întrerupt se reia cu aceeași
+    comandă: antrenările din tabel sunt sărite, iar cele neterminate sunt pornite
+    din nou (cu aceeași sămânță dau același rezultat)
+    :param jobs: antrenările (vezi plan)
+    :param results_file: tabelul cu rezultate (CSV)
+    :param workers: numărul de antrenări simultane (int)
+    :return: None
+    """
+    done = finished_runs(results_file)
+    todo = [job for job in jobs if job["run_id"] not in done]
+    print("{} antrenări, {} deja terminate, {} de rulat pe {} procese".format(
+        len(jobs), len(jobs) - len(todo), len(todo), workers))
+    if not todo:
+        return
+
+    fields = FIELDS + sorted({key for job in jobs for key in job["params"]})
+    new_file = not os.path.exists(results_file)
+    if not new_file:
+        with open(results_file, newline="") as f:
+            if next(csv.reader(f), None) != fields:
+                raise ValueError("{} are alte coloane; folosește alt director pentru acest sweep".format(results_file))
+
+    # Fiecare antrenare are propriul proces (maxtasksperchild=1), pentru că flappy_bird păstrează starea în variabile globale
+    with open(results_file, "a", newline="") as f, \
+            multiprocessing.Pool(workers, maxtasksperchild=1) as pool:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        if new_file:
+            writer.writeheader()
+        for row in pool.imap_unordered(train, todo):
+            writer.writerow(row)
+            f.flush()  # rezultatul rămâne în tabel chiar dacă sweep-ul este întrerupt
+            print("{} seed {}: {} generații, prag la {}, fitness {:.1f}, {:.1f} s".format(
+                row["run_id"], row["seed"], row["generations"], row["generations_to_threshold"] or "-",
+                row["best_fitness"], row["wall_time"]))
+
+
+def summary(results_file, keys, run_ids):
+    """
+    Afișează rezultatele grupate pe variante (media peste sămânțe)
+    :param results_file: tabelul cu rezultate (CSV)
+    :param keys: cheiile variate în sweep
+    :param run_ids: antrenările acestui sweep; tabelul poate avea și rânduri cu altă configurație de bază (set)
+    :return: None
+    """
+    groups = {}
+    with open(results_file, newline="") as f:
+        for row in csv.DictReader(f):
+            if row["run_id"] not in run_ids:
+                continue
+            groups.setdefault(tuple(row[key] for key in keys), []).append(row)
+
+    lines = []
+    for values, rows in groups.items():
+        reached = [int(row["generations_to_threshold"]) for row in rows if row["generations_to_threshold"]]
+        lines.append((
+            len(reached) / len(rows),  # partea rulărilor care ating pragul
+            sum(reached) / len(reached) if reached else float("inf"),
+            " ".join("{}={}".format(key, value) for key, value in zip(keys, values)),
+            sum(float(row["best_fitness"]) for row in rows) / len(rows),
+            sum(float(row["wall_time"]) for row in rows) / len(rows),
+            len(rows),
+        ))
+    # Întâi variantele care ating pragul cel mai des, apoi cele care îl ating mai repede
+    for success, gens, name, best, wall, runs in sorted(lines, key=lambda line: (-line[0], line[1])):
+        print("{:50s} prag {:4.0%}  generații {:6.1f}  fitness {:8.1f}  {:8.1f} s  ({} rulări)".format(
+            name, success, gens, best, wall, runs))
+
+
+if __name__ == '__main__':
+    local_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Caută hiperparametrii NEAT cu mai multe antrenări headless în paralel")
+    parser.add_argument("--grid", type=parse_option, action="append", default=[], metavar="KEY=V1,V2",
+                        help="valorile încercate pentru o cheie din configurație (toate combinațiile)")
+    parser.add_argument("--random", type=parse_option, action="append", default=[], metavar="KEY=MIN:MAX",
+                        help="interval sau listă din care se alege aleator o valoare")
+    parser.add_argument("--samples", type=int, default=10, help="numărul de puncte aleatoare pentru --random")
+    parser.add_argument("--sweep-seed", type=int, default=0, help="sămânța alegerilor pentru --random")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[1, 2, 3], help="sămânțele antrenărilor, pentru fiecare variantă")
+    parser.add_argument("--generations", type=int, default=50, help="numărul maxim de generații al fiecărei antrenări")
+    parser.add_argument("--course-seed", type=int, default=None, help="joacă toate generațiile pe aceleași trasee fixe")
+    parser.add_argument("--courses", type=int, default=1, metavar="K", help="evaluează fiecare genom pe K trasee")
+    parser.add_argument("--max-score", type=int, default=100, help="oprește generația la acest scor (altfel o pasăre bună joacă la nesfârșit)")
+    parser.add_argument("--max-frames", type=int, default=None, help="numărul maxim de frame-uri pe traseu într-o generație")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="numărul de antrenări simultane")
+    parser.add_argument("--config", default=os.path.join(local_dir, "config-feedforward.txt"), help="configurația de bază")
+    parser.add_argument("--output", default="sweep", help="directorul sweep-ului (configurații, jurnale și results.csv)")
+    args = parser.parse_args()
+
+    if not args.grid and not args.random:
+        parser.error("este nevoie de cel puțin o opțiune --grid sau --random")
+    points = variants(args.grid, args.random, args.samples, args.sweep_seed)
+    options = {"course_seed": args.course_seed, "courses": args.courses,
+               "max_score": args.max_score, "max_frames": args.max_frames}
+    jobs = plan(args.config, points, args.seeds, args.generations, options, args.output)
+
+    results_file = os.path.join(args.output, RESULTS)
+    sweep(jobs, results_file, max(args.workers, 1))
+    summary(results_file, sorted({key for point in points for key in point}), {job["run_id"] for job in jobs})
@@ -0,0 +1,129 @@
+import json
+import queue
+import socket
+import threading
+import time
+
+from neat.math_util import mean, stdev
+from neat.reporting import BaseReporter
+
+
+class TelemetryReporter(BaseReporter):
+    """
+    Trimite câte o înregistrare JSON pe linie (NDJSON) pentru fiecare generație:
+    fitness-ul maxim și mediu, speciile, timpul generației și statisticile
+    simulării. Înregistrările sunt puse într-o coadă, iar serializarea și
+    scrierea se fac pe un fir separat, deci antrenarea nu așteaptă niciodată
+    după disc sau rețea. Dacă destinația nu răspunde, înregistrările se pierd
+    (și sunt numărate), iar conexiunea se reîncearcă la următoarea generație
+    """
+
+    def __init__(self, target, stats_func=None, max_queue=1000):
+        """
+        Creează reporterul și pornește firul care scrie
+        :param target: un fișier (str), "tcp://host:port" sau "unix:///cale/socket"
+        :param stats_func: funcție care returnează câmpuri suplimentare pentru generația curentă (dict)
+        :param max_queue: numărul maxim de înregistrări care așteaptă să fie scrise (int)
+        :return: None
+        """
+        self.target = target
+        self.stats_func = stats_func
+        self.queue = queue.Queue(max_queue)
+        self.dropped = 0  # înregistrările pierdute (coada plină sau destinația indisponibilă)
+        self.generation = None
+        self.generation_start = None
+        self.writer = threading.Thread(target=self._write_loop, daemon=True)
+        self.writer.start()
+
+    def start_generation(self, generation):
+        self.generation = generation
+        self.generation_start = time.perf_counter()
+
+    def post_evaluate(self, config, population, species, best_genome):
+        elapsed = time.perf_counter() - self.generation_start
+        fitness = [genome.fitness for genome in population.values() if genome.fitness is not None]
+        record = {
+            "generation": self.generation,
+            "time": time.time(),
+            "wall_time": elapsed,
+            "population": len(population),
+            "best_fitness": best_genome.fitness,
+            "mean_fitness": mean(fitness),
+            "stdev_fitness": stdev(fitness),
+            "species": len(species.species),
+            "species_sizes": {str(sid): len(s.members) for sid, s in species.species.items()},
+        }
+        if self.stats_func is not None:
+            record.update(self.stats_func())
+        if record.get("bird_steps") and elapsed > 0:
+            record["sims_per_sec"] = record["bird_steps"] / elapsed
+        self.emit(record)
+
+    def emit(self, record):
+        """
+        Pune o înregistrare în coadă, fără să aștepte
+        :param record: înregistrarea (dict serializabil JSON)
+        :return: None
+        """
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """
+        Scrie înregistrările rămase în coadă și oprește firul
+        :return: None
+        """
+        self.queue.put(None)
+        self.writer.join()
+
+    def _write_loop(self):
+        """
+        Scrie înregistrările din coadă, câte un grup la fiecare trezire
+        :return: None
+        """
+        stream = None
+        done = False
+        while not done:
+            batch = [self.queue.get()]
+            while True:  # tot ce s-a adunat între timp se scrie deodată
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:  # close()
+                done = True
+                batch = [record for record in batch if record is not None]
+            if not batch:
+                continue
+
+            lines = "".join(json.dumps(record) + "\n" for record in batch)
+            try:
+                if stream is None:
+                    stream = _open_stream(self.target)
+                stream.write(lines)
+                stream.flush()  # fișierul poate fi urmărit cu tail -f
+            except OSError:
+                self.dropped += len(batch)
+                stream = None
+        if stream is not None:
+            stream.close()
+
+
+def _open_stream(target):
+    """
+    Deschide destinația înregistrărilor
+    :param target: un fișier (str), "tcp://host:port" sau "unix:///cale/socket"
+    :return: obiect de tip fișier text
+    """
+    if target.startswith("tcp://"):
+        host, port = target[len("tcp://"):].rsplit(":", 1)
+        sock = socket.create_connection((host, int(port)), timeout=5)
+        return sock.makefile("w", encoding="utf-8")
+    if target.startswith("unix://"):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(5)
+        sock.connect(target[len("unix://"):])
+        return sock.makefile("w", encoding="utf-8")
+    return open(target, "a", encoding="utf-8")